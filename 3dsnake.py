@@ -3,8 +3,11 @@ from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import numpy as np
-import random
 import pygame_gui
+from rng import RandomStream
+from scheduler import FixedStep
+from snake_body import SnakeBody
+from snake_render import SnakeRenderer
 
 # Initialize Pygame
 pygame.init()
@@ -15,13 +18,17 @@ pygame.display.set_caption('3D Snake Game')
 gluPerspective(45, (800 / 600), 0.1, 50.0)
 glTranslatef(0.0, 0.0, -15)
 
+# Random stream for food placement (pass a seed for a reproducible game)
+rng = RandomStream()
+
 # Snake parameters
-snake = [(0, 0, 0)]
+arena = 10
+snake = SnakeBody((0, 0, 0), arena)
 direction = (1, 0, 0)
 score = 0
 
 # Food parameters
-food = (random.randint(0, 9), random.randint(0, 9), random.randint(0, 9))
+food = snake.place_food(rng)
 
 # GUI manager
 manager = pygame_gui.UIManager((800, 600))
@@ -34,32 +41,15 @@ zoom_slider = pygame_gui.elements.UIHorizontalSlider(relative_rect=pygame.Rect((
 camera_pos = [0.0, 0.0, -15.0]
 camera_rot = [0.0, 0.0]
 
-# Game loop
+# Game loop: the snake moves 5 times per second while rendering runs at 60 fps.
+# At most 2 moves per frame: a frame slower than 2 / 5 = 0.4 s loses moves
+# instead of making the snake jump ahead
 running = True
 clock = pygame.time.Clock()
+snake_steps = FixedStep(5, max_steps=2)
 
-def draw_cube(x, y, z, color):
-    vertices = (
-        (x - 0.5, y - 0.5, z - 0.5),
-        (x + 0.5, y - 0.5, z - 0.5),
-        (x + 0.5, y + 0.5, z - 0.5),
-        (x - 0.5, y + 0.5, z - 0.5),
-        (x - 0.5, y - 0.5, z + 0.5),
-        (x + 0.5, y - 0.5, z + 0.5),
-        (x + 0.5, y + 0.5, z + 0.5),
-        (x - 0.5, y + 0.5, z + 0.5)
-    )
-    edges = (
-        (0, 1), (1, 2), (2, 3), (3, 0),
-        (4, 5), (5, 6), (6, 7), (7, 4),
-        (0, 4), (1, 5), (2, 6), (3, 7)
-    )
-    glColor3fv(color)
-    glBegin(GL_QUADS)
-    for surface in edges:
-        for vertex in surface:
-            glVertex3fv(vertices[vertex])
-    glEnd()
+# Snake and food cubes, drawn with a single instanced draw call
+renderer = SnakeRenderer(snake.head, food)
 
 def draw_text(text, font, color, surface, x, y):
     textobj = font.render(text, True, color)
@@ -109,6 +99,7 @@ while running:
                     camera_pos[0] += 1
         elif event.type == VIDEORESIZE:
             screen = pygame.display.set_mode((event.w, event.h), DOUBLEBUF | OPENGL | RESIZABLE)
+            renderer.reset_gl()
             glViewport(0, 0, event.w, event.h)
             glMatrixMode(GL_PROJECTION)
             glLoadIdentity()
@@ -122,22 +113,19 @@ while running:
 
     manager.update(time_delta)
 
-    # Move snake
-    head = snake[0]
-    new_head = (head[0] + direction[0], head[1] + direction[1], head[2] + direction[2])
-    snake.insert(0, new_head)
-
-    # Check if snake eats food
-    if new_head == food:
-        score += 1
-        food = (random.randint(0, 9), random.randint(0, 9), random.randint(0, 9))
-    else:
-        snake.pop()
+    for _ in range(snake_steps.due()):
+        # Move snake (wrapping around the edges); it grows when it eats the food
+        ate = snake.next_head(direction) == snake.pack(food)
+        head, _ = snake.advance(direction, grow=ate)
+        renderer.advance(head, grow=ate)
 
-    # Wrap around the edges
-    for i in range(len(snake)):
-        x, y, z = snake[i]
-        snake[i] = (x % 10, y % 10, z % 10)
+        if ate:
+            score += 1
+            food = snake.place_food(rng)
+            if food is None:  # The snake fills the whole arena
+                running = False
+                break
+            renderer.set_food(food)
 
     # Clear screen and depth buffer
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -152,12 +140,8 @@ while running:
     glRotatef(camera_rot[0], 1, 0, 0)
     glRotatef(camera_rot[1], 0, 1, 0)
 
-    # Draw snake
-    for segment in snake:
-        draw_cube(*segment, (0, 1, 0))  # Green color for snake
-
-    # Draw food
-    draw_cube(*food, (1, 0, 0))  # Red color for food
+    # Draw snake (green) and food (red)
+    renderer.draw()
 
     # Draw GUI
     manager.draw_ui(screen)
@@ -168,6 +152,5 @@ while running:
 
     # Update display
     pygame.display.flip()
-    clock.tick(5)
 
 pygame.quit()
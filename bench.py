@@ -0,0 +1,428 @@
+import argparse
+import collections
+import json
+import resource
+import sys
+import time
+
+import numpy as np
+
+import life
+import life3d
+import rules
+from ecosystem import Plant, Herbivore, Carnivore, World
+from ecosystem_soa import ArrayWorld
+from bricks3d import BrickLife3D
+from hashlife import HashLife
+from life_bits import BitGrid
+from life_parallel import ParallelLife, ParallelLife3D
+from life_sparse import SparseLife
+from life_tiles import TiledLife
+from profiling import Profiler
+from rng import RandomStream
+from scheduler import FixedStep
+from snake_env import SnakeEnv, DIRECTIONS
+from snake_render import SnakeRenderer
+from telemetry import LifeTelemetry
+
+# Headless runner: runs the simulations without pygame, VPython or matplotlib
+# and prints one JSON line of timing per run.
+
+LIFE2D_ENGINES = ('dense', 'bits', 'tiled', 'parallel', 'hashlife', 'sparse', 'loop')
+LIFE3D_ENGINES = ('dense', 'parallel', 'bricks')
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+def random_grid(rows, cols, seed, density=0.25):
+    return RandomStream(seed).random_grid((rows, cols), density)
+
+
+def _run_steps(step, state, generations, telemetry=None, changed=None):
+    # Steps state up to generations times; with telemetry, stops early once the
+    # board has died or entered a cycle (changed is passed on to observe).
+    # Returns (state, generations run, extra)
+    for generation in range(1, generations + 1):
+        state = step(state)
+        if telemetry is not None:
+            telemetry.observe(state, changed=changed)
+            if telemetry.settled:
+                break
+    else:
+        generation = generations
+    if telemetry is None:
+        return state, generation, {}
+    return state, generation, {'settled': telemetry.settled, 'period': telemetry.period}
+
+
+def _report(kind, engine, shape, steps, elapsed, population, **extra):
+    cells = int(np.prod(shape))
+    result = {
+        'sim': kind,
+        'engine': engine,
+        'shape': list(shape),
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_sec': steps / elapsed if elapsed else float('inf'),
+        'cells_per_sec': cells * steps / elapsed if elapsed else float('inf'),
+        'population': population,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    result.update(extra)
+    return result
+
+
+def run_life2d(engine='dense', rows=512, cols=512, generations=100, seed=0, wrap=False, workers=None,
+               rule='B3/S23', until_settled=False, telemetry_every=64):
+    # until_settled stops the run once the board dies or cycles (dense, loop and tiled only)
+    grid = random_grid(rows, cols, seed)
+    rule = rules.parse(rule)
+    if engine in ('bits', 'hashlife') and rule != rules.CONWAY:
+        raise ValueError(f"the {engine} engine only runs B3/S23, not {rule}")
+    if until_settled and engine not in ('dense', 'loop', 'tiled'):
+        raise ValueError(f"until_settled is not supported by the {engine} engine")
+    telemetry = LifeTelemetry(grid, every=telemetry_every) if until_settled else None
+    extra = {}
+    if engine == 'bits':
+        board = BitGrid.from_array(grid, wrap=wrap)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        population = board.population()
+    elif engine == 'tiled':
+        board = TiledLife(grid, wrap=wrap, rule=rule)
+        start = time.perf_counter()
+        _, generations, extra = _run_steps(lambda state: board.step(), board.grid, generations, telemetry,
+                                           board.changed_cells)
+        elapsed = time.perf_counter() - start
+        population = int(board.grid.sum())
+    elif engine == 'parallel':
+        board = ParallelLife(grid, workers, wrap=wrap, rule=rule)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        board.close()
+        population = int(board.grid.sum())
+    elif engine == 'hashlife':
+        # Hashlife runs on the unbounded plane, so wrap does not apply
+        board = HashLife.from_array(grid)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        population = board.population()
+    elif engine == 'sparse':
+        # Also unbounded: only the live cells are stored
+        board = SparseLife.from_array(grid, rule=rule)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        population = board.population()
+        extra = {'nbytes': board.nbytes()}
+    else:
+        step = life.get_engine(engine, rule)
+        start = time.perf_counter()
+        grid, generations, extra = _run_steps(lambda state: step(state, wrap=wrap), grid, generations, telemetry)
+        elapsed = time.perf_counter() - start
+        population = int(grid.sum())
+    return _report('life2d', engine, (rows, cols), generations, elapsed, population, rule=str(rule), **extra)
+
+
+def run_life3d(size=64, generations=20, seed=0, rule='B4/S4-6/3D', engine='dense', workers=None,
+               until_settled=False, telemetry_every=64):
+    cells = RandomStream(seed).random_grid((size, size, size), 0.5)
+    rule = rules.parse(rule, dims=3)
+    if until_settled and engine != 'dense':
+        raise ValueError(f"until_settled is not supported by the {engine} engine")
+    extra = {}
+    if engine == 'parallel':
+        board = ParallelLife3D(cells, workers=workers, rule=rule)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        board.close()
+        cells = board.cells
+    elif engine == 'bricks':
+        # 16^3 bricks, so size must be a multiple of 16
+        board = BrickLife3D.from_array(cells, rule=rule)
+        start = time.perf_counter()
+        board.step(generations)
+        elapsed = time.perf_counter() - start
+        cells = board.to_array()
+        extra = {'bricks': len(board.bricks), 'nbytes': board.nbytes()}
+    else:
+        telemetry = LifeTelemetry(cells, every=telemetry_every) if until_settled else None
+        start = time.perf_counter()
+        cells, generations, extra = _run_steps(lambda state: life3d.step(state, rule=rule), cells, generations,
+                                               telemetry)
+        elapsed = time.perf_counter() - start
+    return _report('life3d', engine, (size, size, size), generations, elapsed, int(cells.sum()),
+                   rule=str(rule), **extra)
+
+
+def _population(world):
+    if isinstance(world, ArrayWorld):
+        return sum(world.populations().values())
+    if world.plants is not None:
+        return len(world.organisms) + world.plants.count()
+    return len(world.organisms)
+
+
+def run_ecosystem(width=100, height=100, ticks=200, seed=0, plants=50, herbivores=20, carnivores=5,
+                  backend='object', profile=False):
+    counts = ((Plant, plants), (Herbivore, herbivores), (Carnivore, carnivores))
+    if backend == 'array':
+        world = ArrayWorld(width, height, seed)
+        for cls, count in counts:
+            world.spawn(cls, count)
+    else:
+        world = World(width, height, seed, plant_field=backend == 'raster')
+        rng = world.rng
+        for cls, count in counts:
+            for _ in range(count):
+                world.add_organism(cls(rng.randint(0, width - 1), rng.randint(0, height - 1), rng))
+        if profile:
+            world.profiler = Profiler(window=ticks)
+    updates = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        updates += _population(world)
+        world.update()
+    elapsed = time.perf_counter() - start
+    extra = {}
+    if profile and backend != 'array':
+        extra['phases'] = world.profiler.summary()['phases']
+    return _report('ecosystem', backend, (width, height), ticks, elapsed, _population(world),
+                   organism_updates_per_sec=updates / elapsed if elapsed else float('inf'), **extra)
+
+
+class MockGL:
+    # Stands in for OpenGL.GL when there is no GL context; counts the calls made
+    def __init__(self):
+        self.calls = collections.Counter()
+
+    def __getattr__(self, name):
+        if name.startswith('GL_'):
+            return 0
+
+        def call(*args):
+            self.calls[name] += 1
+            return 1
+        return call
+
+
+def run_snake_render(segments=10000, frames=200, arena=10):
+    gl = MockGL()
+    renderer = SnakeRenderer((0, 0, 0), (5, 5, 5), gl=gl)
+    for i in range(1, segments):
+        renderer.advance((i % arena, i // arena % arena, i // arena ** 2 % arena), grow=True)
+    renderer.draw()
+    gl.calls.clear()
+    start = time.perf_counter()
+    for i in range(frames):
+        renderer.advance((i % arena, 0, 0))
+        renderer.draw()
+    elapsed = time.perf_counter() - start
+    return _report('snake_render', 'instanced', (segments,), frames, elapsed, segments,
+                   frame_ms=1000 * elapsed / frames,
+                   draw_calls_per_frame=gl.calls['glDrawArraysInstanced'] / frames,
+                   gl_calls_per_frame=sum(gl.calls.values()) / frames)
+
+
+def run_snake_env(envs=4096, steps=500, arena=10, seed=0):
+    env = SnakeEnv(envs, arena, seed)
+    # Random actions, drawn up front so only the environment is timed
+    actions = RandomStream(seed).integers(0, len(DIRECTIONS), (steps, envs))
+    episodes = 0
+    start = time.perf_counter()
+    for t in range(steps):
+        info = env.step(actions[t])[4]
+        episodes += len(info.get('done', ()))
+    elapsed = time.perf_counter() - start
+    return _report('snake_env', 'batched', (envs,), steps, elapsed, int(env.length.sum()),
+                   env_steps_per_sec=envs * steps / elapsed if elapsed else float('inf'),
+                   episodes=episodes)
+
+
+def _check_tiled(name, grid, generations=8, tile=16, wrap=False):
+    board = TiledLife(grid, tile=tile, wrap=wrap)
+    expected = grid
+    for _ in range(generations):
+        expected = life.step(expected, wrap=wrap)
+        board.step()
+        if not np.array_equal(board.to_array(), expected):
+            return {'check': name, 'ok': False, 'generation': board.generation}
+    return {'check': name, 'ok': True}
+
+
+def _check_rule_strings():
+    # str(rule) must parse back to the same rule, including two-digit counts
+    generator = RandomStream(0).generator
+    samples = [rules.CONWAY, rules.Rule({12}, range(4, 7), dims=3), rules.Rule({3}, {10}, dims=3),
+               rules.Rule({10, 11}, {2, 13, 20}, dims=3), rules.Rule(set(), set()),
+               rules.Rule({2}, {3, 4}, neighborhood='V', radius=2)]
+    for _ in range(200):
+        dims = int(generator.integers(2, 4))
+        limit = rules.neighborhood_size(dims, 'M', 1) + 1
+        samples.append(rules.Rule(set(generator.choice(limit, generator.integers(0, 4)).tolist()),
+                                  set(generator.choice(limit, generator.integers(0, 4)).tolist()), dims))
+    failures = [str(rule) for rule in samples if rules.parse(str(rule)) != rule]
+    return {'check': 'rule_round_trip', 'ok': not failures, 'failures': failures[:5]}
+
+
+def _check_telemetry_hints(name, grid, generations=60, every=1):
+    # Telemetry fed TiledLife.changed_cells must match a full compare, including
+    # a block toggled by hand halfway through
+    board = TiledLife(grid)
+    hinted = LifeTelemetry(board.grid, every=every)
+    full = LifeTelemetry(board.grid, every=every)
+    mismatches = []
+    for generation in range(1, generations + 1):
+        if generation == generations // 2:
+            for r, c in ((40, 40), (40, 41), (41, 40), (41, 41)):
+                board.grid[r, c] ^= 1
+                board.mark(r, c)
+        board.step()
+        hinted.observe(board.grid, changed=board.changed_cells)
+        full.observe(board.grid)
+        if (hinted.hash, hinted.population, hinted.bbox) != (full.hash, full.population, full.bbox):
+            mismatches.append(generation)
+    return {'check': name, 'ok': not mismatches, 'mismatches': mismatches[:5]}
+
+
+def _check_fixed_step():
+    # 8 steps/s capped at 4 per frame: short frames carry the leftover time,
+    # a 1 s frame runs 4 steps and drops the rest instead of bursting afterwards
+    # (binary fractions, so the float arithmetic is exact)
+    now = [0.0]
+    scheduler = FixedStep(8, max_steps=4, clock=lambda: now[0])
+    steps = []
+    for frame in (0.3125, 0.3125, 1.0, 0.1875, 0.0625):
+        now[0] += frame
+        steps.append(scheduler.due())
+    return {'check': 'fixed_step_cap', 'ok': steps == [2, 3, 4, 1, 1], 'steps': steps}
+
+
+def checks():
+    # Regression checks of the engines against the dense reference; one JSON line each
+    still = np.zeros((64, 64), dtype=int)
+    still[10:12, 10:12] = 1
+    yield _check_tiled('tiled_empty', np.zeros((60, 80), dtype=int))
+    yield _check_tiled('tiled_still_life', still)
+    yield _check_tiled('tiled_soup', random_grid(97, 131, 0), generations=40)
+    yield _check_tiled('tiled_soup_wrap', random_grid(97, 131, 1), generations=40, wrap=True)
+    yield _check_rule_strings()
+    yield _check_fixed_step()
+    quiet = np.zeros((300, 300), dtype=int)
+    quiet[100, 100:103] = 1
+    quiet[200:202, 250:252] = 1
+    quiet[5, 6] = quiet[6, 7] = quiet[7, 5:8] = 1
+    yield _check_telemetry_hints('telemetry_hints_quiet', quiet)
+    yield _check_telemetry_hints('telemetry_hints_quiet_every', quiet, every=8)
+    yield _check_telemetry_hints('telemetry_hints_soup', random_grid(97, 131, 2), every=4)
+
+
+def suite(sizes=(256, 1024, 2048), generations=20, seed=0):
+    for size in sizes:
+        for engine in LIFE2D_ENGINES:
+            if engine == 'loop' and size > 256:
+                continue  # the reference loop takes minutes on large boards
+            yield run_life2d(engine, size, size, generations, seed)
+    for size in (32, 64, 128):
+        for engine in LIFE3D_ENGINES:
+            yield run_life3d(size, generations, seed, engine=engine)
+    for population in (100, 1000):
+        for backend in ('object', 'array', 'raster'):
+            yield run_ecosystem(ticks=generations, seed=seed, plants=population,
+                                herbivores=population // 4, carnivores=population // 16, backend=backend)
+    for segments in (100, 10000):
+        yield run_snake_render(segments, generations)
+    for envs in (1024, 16384):
+        yield run_snake_env(envs, generations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless simulation runner and benchmark.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('life2d')
+    p.add_argument('--engine', choices=LIFE2D_ENGINES, default='dense')
+    p.add_argument('--rows', type=int, default=512)
+    p.add_argument('--cols', type=int, default=512)
+    p.add_argument('--generations', type=int, default=100)
+    p.add_argument('--wrap', action='store_true')
+    p.add_argument('--rule', default='B3/S23', help='rulestring, e.g. B36/S23 or B3/S23/NV/R2')
+    p.add_argument('--until-settled', action='store_true', help='stop once the board dies or cycles')
+    p.add_argument('--telemetry-every', type=int, default=64)
+    p.add_argument('--workers', type=int)
+    p.add_argument('--seed', type=int, default=0)
+
+    p = sub.add_parser('life3d')
+    p.add_argument('--engine', choices=LIFE3D_ENGINES, default='dense')
+    p.add_argument('--rule', default='B4/S4-6/3D')
+    p.add_argument('--until-settled', action='store_true', help='stop once the board dies or cycles')
+    p.add_argument('--telemetry-every', type=int, default=64)
+    p.add_argument('--workers', type=int)
+    p.add_argument('--size', type=int, default=64)
+    p.add_argument('--generations', type=int, default=20)
+    p.add_argument('--seed', type=int, default=0)
+
+    p = sub.add_parser('ecosystem')
+    p.add_argument('--width', type=int, default=100)
+    p.add_argument('--height', type=int, default=100)
+    p.add_argument('--ticks', type=int, default=200)
+    p.add_argument('--plants', type=int, default=50)
+    p.add_argument('--herbivores', type=int, default=20)
+    p.add_argument('--carnivores', type=int, default=5)
+    p.add_argument('--backend', choices=('object', 'array', 'raster'), default='object',
+                   help='raster: object model with plants in a PlantField')
+    p.add_argument('--profile', action='store_true', help='add per-phase timings (object and raster)')
+    p.add_argument('--seed', type=int, default=0)
+
+    p = sub.add_parser('snake-render')
+    p.add_argument('--segments', type=int, default=10000)
+    p.add_argument('--frames', type=int, default=200)
+
+    p = sub.add_parser('snake-env')
+    p.add_argument('--envs', type=int, default=4096)
+    p.add_argument('--steps', type=int, default=500)
+    p.add_argument('--arena', type=int, default=10)
+    p.add_argument('--seed', type=int, default=0)
+
+    sub.add_parser('check', help='regression checks; exits with status 1 on failure')
+
+    p = sub.add_parser('suite')
+    p.add_argument('--sizes', type=int, nargs='+', default=[256, 1024, 2048])
+    p.add_argument('--generations', type=int, default=20)
+    p.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == 'life2d':
+        results = [run_life2d(args.engine, args.rows, args.cols, args.generations, args.seed, args.wrap,
+                              args.workers, args.rule, args.until_settled, args.telemetry_every)]
+    elif args.command == 'life3d':
+        results = [run_life3d(args.size, args.generations, args.seed, args.rule, args.engine, args.workers,
+                              args.until_settled, args.telemetry_every)]
+    elif args.command == 'ecosystem':
+        results = [run_ecosystem(args.width, args.height, args.ticks, args.seed,
+                                 args.plants, args.herbivores, args.carnivores, args.backend, args.profile)]
+    elif args.command == 'snake-render':
+        results = [run_snake_render(args.segments, args.frames)]
+    elif args.command == 'snake-env':
+        results = [run_snake_env(args.envs, args.steps, args.arena, args.seed)]
+    elif args.command == 'check':
+        results = list(checks())
+        for result in results:
+            print(json.dumps(result), flush=True)
+        return 0 if all(result['ok'] for result in results) else 1
+    else:
+        results = suite(args.sizes, args.generations, args.seed)
+    for result in results:
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import itertools
+
+import numpy as np
+
+import rules
+from life import _check_rule
+
+# Almacenamiento por ladrillos para la Vida 3D. El espacio se divide en cubos
+# de brick^3 celdas uint8 guardados en un diccionario por coordenada de
+# ladrillo; los ladrillos vacíos no se guardan. Cada generación sólo se calculan
+# los ladrillos con celdas vivas y sus 26 vecinos, leyendo un halo de una celda
+# (caras, aristas y esquinas) de los ladrillos de alrededor. La memoria sigue a
+# la región ocupada y no al tamaño del volumen.
+#
+# Con size el espacio es un toroide de size^3 (como en conway3d.py); sin size
+# es ilimitado.
+
+_OFFSETS = list(itertools.product((-1, 0, 1), repeat=3))
+
+
+class BrickLife3D:
+    def __init__(self, size=None, brick=16, rule=rules.parse('B4/S4-6/3D')):
+        _check_rule(rule, dims=3)
+        if 0 in rule.birth:
+            raise ValueError(f"Con {rule} nacerían celdas en todos los ladrillos vacíos")
+        if size is not None and size % brick:
+            raise ValueError(f"El tamaño {size} debe ser múltiplo del ladrillo ({brick})")
+        self.size = size
+        self.brick = brick
+        self.rule = rule
+        self.bricks = {}
+        self.generation = 0
+        self.stepped = 0
+
+    @classmethod
+    def from_array(cls, cells, brick=16, rule=rules.parse('B4/S4-6/3D'), wrap=True):
+        # Con wrap, el arreglo cúbico es el toroide completo; sin wrap se
+        # coloca en el origen de un espacio ilimitado
+        if wrap and len(set(cells.shape)) != 1:
+            raise ValueError(f"El toroide debe ser cúbico, no {cells.shape}")
+        life = cls(cells.shape[0] if wrap else None, brick, rule)
+        life.load(cells)
+        return life
+
+    def _key(self, key):
+        if self.size is None:
+            return key
+        n = self.size // self.brick
+        return tuple(k % n for k in key)
+
+    # --- edición y consulta ---
+
+    def load(self, cells, origin=(0, 0, 0)):
+        # Copia cells a partir de la celda origin, ladrillo por ladrillo
+        b = self.brick
+        x, y, z = np.nonzero(cells == 1)
+        if not len(x):
+            return
+        coords = np.stack([x + origin[0], y + origin[1], z + origin[2]], axis=1)
+        if self.size is not None:
+            coords %= self.size
+        keys, inverse = np.unique(coords // b, axis=0, return_inverse=True)
+        # Celdas agrupadas por ladrillo
+        order = np.argsort(inverse.ravel(), kind='stable')
+        groups = np.split((coords % b)[order], np.cumsum(np.bincount(inverse.ravel()))[:-1])
+        for key, local in zip(map(tuple, keys.tolist()), groups):
+            block = self.bricks.get(key)
+            if block is None:
+                block = self.bricks[key] = np.zeros((b, b, b), dtype=np.uint8)
+            block[local[:, 0], local[:, 1], local[:, 2]] = 1
+
+    def set(self, x, y, z, alive=True):
+        b = self.brick
+        key = self._key((x // b, y // b, z // b))
+        block = self.bricks.get(key)
+        if block is None:
+            if not alive:
+                return
+            block = self.bricks[key] = np.zeros((b, b, b), dtype=np.uint8)
+        block[x % b, y % b, z % b] = alive
+        if not alive and not block.any():
+            del self.bricks[key]
+
+    def get(self, x, y, z):
+        b = self.brick
+        block = self.bricks.get(self._key((x // b, y // b, z // b)))
+        return block is not None and bool(block[x % b, y % b, z % b])
+
+    def to_array(self, shape=None, origin=(0, 0, 0), dtype=np.uint8):
+        # Ventana de shape celdas desde origin (por defecto, el toroide completo)
+        if shape is None:
+            if self.size is None:
+                raise ValueError("Un espacio ilimitado necesita el tamaño de la ventana")
+            shape = (self.size,) * 3
+        b = self.brick
+        out = np.zeros(shape, dtype=dtype)
+        for key, block in self.bricks.items():
+            lo = [k * b - o for k, o in zip(key, origin)]
+            if self.size is not None:
+                # En el toroide un ladrillo se ve en la copia más cercana a la ventana
+                lo = [(v + b - 1) % self.size - (b - 1) for v in lo]
+            src, dst = [], []
+            for start, extent in zip(lo, shape):
+                a, c = max(start, 0), min(start + b, extent)
+                if a >= c:
+                    break
+                src.append(slice(a - start, c - start))
+                dst.append(slice(a, c))
+            else:
+                out[tuple(dst)] = block[tuple(src)]
+        return out
+
+    # --- paso ---
+
+    def _padded(self, key):
+        # Ladrillo key con un halo de una celda tomado de sus 26 vecinos
+        b = self.brick
+        out = np.zeros((b + 2,) * 3, dtype=np.uint8)
+        for offset in _OFFSETS:
+            block = self.bricks.get(self._key(tuple(k + d for k, d in zip(key, offset))))
+            if block is None:
+                continue
+            src = tuple(slice(b - 1, b) if d < 0 else slice(0, 1) if d > 0 else slice(None) for d in offset)
+            dst = tuple(slice(0, 1) if d < 0 else slice(b + 1, b + 2) if d > 0 else slice(1, b + 1) for d in offset)
+            out[dst] = block[src]
+        return out
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            # Ladrillos con celdas vivas y sus vecinos (sólo ahí puede nacer algo)
+            todo = {self._key(tuple(k + d for k, d in zip(key, offset)))
+                    for key in self.bricks for offset in _OFFSETS}
+            keys = list(todo)
+            self.stepped = len(keys)
+            if not keys:
+                break
+            # Todos los ladrillos a la vez: un bloque (N, b+2, b+2, b+2)
+            padded = np.stack([self._padded(key) for key in keys])
+            total = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+            total = total[:, :, :-2] + total[:, :, 1:-1] + total[:, :, 2:]
+            total = total[:, :, :, :-2] + total[:, :, :, 1:-1] + total[:, :, :, 2:]
+            alive = padded[:, 1:-1, 1:-1, 1:-1]
+            new = rules.apply(self.rule, alive, total - alive)
+            occupied = new.reshape(len(keys), -1).any(axis=1)
+            # Copias, para no retener el bloque entero por los ladrillos vacíos
+            self.bricks = {key: new[i].copy() for i, key in enumerate(keys) if occupied[i]}
+            self.generation += 1
+        return self
+
+    # --- estadísticas ---
+
+    def population(self):
+        return int(sum(np.count_nonzero(block) for block in self.bricks.values()))
+
+    def nbytes(self):
+        return sum(block.nbytes for block in self.bricks.values())
+
+    def stats(self):
+        return {
+            'generation': self.generation,
+            'population': self.population(),
+            'bricks': len(self.bricks),
+            'stepped_bricks': self.stepped,
+            'nbytes': self.nbytes(),
+        }
@@ -1,6 +1,13 @@
 import pygame
 import numpy as np
-import random
+import life
+import rules
+from life_render import GridRenderer
+from life_sparse import SparseLife
+from life_tiles import TiledLife
+from rng import RandomStream
+from scheduler import FixedStep
+from telemetry import LifeTelemetry
 
 # Inicializar pygame
 pygame.init()
@@ -19,31 +26,70 @@ GRAY = (128, 128, 128)
 BUTTON_COLOR = (0, 128, 0)
 BUTTON_HOVER_COLOR = (0, 255, 0)
 
+# Motor de simulación ('dense', 'bits', 'loop', 'tiled' o 'sparse') y bordes toroidales
+engine = 'dense'
+wrap = False
+# Regla en notación B/S, p. ej. 'B36/S23' (HighLife); los motores 'bits' y
+# 'loop' sólo implementan B3/S23 y 'tiled' sólo vecindades de Moore de radio 1
+rule = rules.parse('B3/S23')
+step_grid = None if engine in ('tiled', 'sparse') else life.get_engine(engine, rule)
+
+# Generador de números aleatorios (se le puede pasar una semilla)
+rng = RandomStream()
+
 # Crear una matriz para la grilla
 grid = np.zeros((rows, cols), dtype=int)
+renderer = GridRenderer(rows, cols, cell_size, alive=WHITE, dead=BLACK)
+
+# En modo 'tiled' la grilla es una vista del tablero por teselas
+tiles = None
+if engine == 'tiled':
+    tiles = TiledLife(grid, wrap=wrap, rule=rule)
+    grid = tiles.grid
+
+# En modo 'sparse' el tablero es el plano infinito (wrap no aplica) y la grilla
+# es la ventana visible, que se mueve con las flechas
+board = None
+view_top, view_left = 0, 0
+pan = 10
+if engine == 'sparse':
+    board = SparseLife.from_array(grid, rule=rule)
+
+# Población, nacimientos, muertes y hash de cada generación; con auto_stop la
+# simulación se pausa sola cuando el tablero muere o entra en un ciclo. Sólo
+# para tableros fijos: en modo 'sparse' la ventana no representa al plano.
+# Se observa una generación de cada 64 para que la telemetría cueste menos del
+# 2% del paso aunque haya que comparar el tablero entero; el ciclo se detecta
+# entonces con hasta un par de muestras de atraso. En modo 'tiled' sólo se
+# comparan las celdas que el motor informa como cambiadas.
+auto_stop = True
+telemetry_every = 64
+telemetry = LifeTelemetry(grid, every=telemetry_every) if board is None else None
 
 def draw_grid():
-    for x in range(0, width, cell_size):
-        for y in range(0, height, cell_size):
-            rect = pygame.Rect(x, y, cell_size, cell_size)
-            if grid[y // cell_size, x // cell_size] == 1:
-                pygame.draw.rect(screen, WHITE, rect)
-            else:
-                pygame.draw.rect(screen, BLACK, rect, 1)
+    renderer.draw(screen, grid)
 
 def update_grid():
     global grid
-    new_grid = np.copy(grid)
-    for r in range(rows):
-        for c in range(cols):
-            total = np.sum(grid[max(0, r-1):min(rows, r+2), max(0, c-1):min(cols, c+2)])
-            if grid[r, c] == 1:
-                total -= 1
-                if total < 2 or total > 3:
-                    new_grid[r, c] = 0
-            elif total == 3:
-                new_grid[r, c] = 1
-    grid = new_grid
+    if board is not None:
+        board.step()
+        grid = board.to_array(rows, cols, view_top, view_left)
+    elif tiles is not None:
+        grid = tiles.step()
+    else:
+        grid = step_grid(grid, wrap=wrap)
+    if telemetry is not None:
+        telemetry.observe(grid, changed=tiles.changed_cells if tiles is not None else None)
+
+def report_settled():
+    if telemetry.extinct:
+        print(f'Generación {telemetry.generation}: el tablero quedó vacío')
+    else:
+        print(f'Generación {telemetry.generation}: ciclo de período {telemetry.period}, '
+              f'población {telemetry.population}')
+
+# El texto del botón se renderiza una sola vez
+button_text = pygame.font.Font(None, 36).render('Random Grid', True, WHITE)
 
 def draw_button():
     button_rect = pygame.Rect(width - 150, height - 50, 140, 40)
@@ -52,18 +98,37 @@ def draw_button():
         pygame.draw.rect(screen, BUTTON_HOVER_COLOR, button_rect)
     else:
         pygame.draw.rect(screen, BUTTON_COLOR, button_rect)
-    font = pygame.font.Font(None, 36)
-    text = font.render('Random Grid', True, WHITE)
-    screen.blit(text, (width - 140, height - 45))
+    screen.blit(button_text, (width - 140, height - 45))
 
 def generate_random_grid():
-    global grid
-    grid = np.zeros((rows, cols), dtype=int)
+    global grid, board
     # Generar patrones aleatorios interesantes
-    for _ in range(rows * cols // 4):  # Proporción para mantener la grilla entretenida
-        x = random.randint(0, cols - 1)
-        y = random.randint(0, rows - 1)
-        grid[y, x] = 1
+    grid = rng.scatter((rows, cols), rows * cols // 4)  # Proporción para mantener la grilla entretenida
+    if tiles is not None:
+        tiles.load(grid)
+        grid = tiles.grid
+    if board is not None:
+        board = SparseLife.from_array(grid, view_top, view_left, rule)
+    if telemetry is not None:
+        telemetry.reset(grid)
+
+def move_view(dr, dc):
+    global grid, view_top, view_left
+    view_top += dr
+    view_left += dc
+    grid = board.to_array(rows, cols, view_top, view_left)
+
+PAN_KEYS = {pygame.K_UP: (-1, 0), pygame.K_DOWN: (1, 0), pygame.K_LEFT: (0, -1), pygame.K_RIGHT: (0, 1)}
+
+# Pasos de simulación por segundo, independientes de los cuadros dibujados
+steps_per_sec = 10
+fps = 30
+# Tope de pasos por cuadro: si el motor no alcanza steps_per_sec, la
+# simulación se hace más lenta en lugar de acumular atraso. Los pasos que no
+# entran se descartan: un cuadro (paso más dibujo) que tarde más de
+# max_steps_per_frame / steps_per_sec = 0,4 s pierde pasos, no sólo cuadros
+max_steps_per_frame = 4
+scheduler = FixedStep(steps_per_sec, max_steps_per_frame)
 
 # Bucle principal
 running = True
@@ -78,17 +143,32 @@ while running:
                 generate_random_grid()
             else:
                 grid[y // cell_size, x // cell_size] = 1 - grid[y // cell_size, x // cell_size]
+                if tiles is not None:
+                    tiles.mark(y // cell_size, x // cell_size)
+                if board is not None:
+                    board.toggle(view_top + y // cell_size, view_left + x // cell_size)
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 paused = not paused
+            elif board is not None and event.key in PAN_KEYS:
+                dr, dc = PAN_KEYS[event.key]
+                move_view(dr * pan, dc * pan)
 
     if not paused:
-        update_grid()
+        settled = telemetry is not None and telemetry.settled
+        for _ in range(scheduler.due()):
+            update_grid()
+        # Sólo al pasar a muerto o cíclico, así un tablero vacío no pausa al empezar
+        if auto_stop and telemetry is not None and telemetry.settled and not settled:
+            paused = True
+            report_settled()
+    else:
+        scheduler.reset()
 
     screen.fill(BLACK)
     draw_grid()
     draw_button()
     pygame.display.flip()
-    clock.tick(10)
+    clock.tick(fps)
 
 pygame.quit()
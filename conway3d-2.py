@@ -1,10 +1,21 @@
 import numpy as np
+import life3d
+import rules
+from scheduler import FixedStep
+from telemetry import LifeTelemetry
+from voxel_scene import VoxelScene
 from vpython import *
 import random
 
 # Configuración inicial
 size = 20
-cells = np.zeros((size, size, size))
+cells = np.zeros((size, size, size), dtype=np.uint8)
+
+# Población y detección de ciclos; con auto_stop se pausa al morir o repetirse.
+# Se observa una generación de cada 64 para que comparar el tablero entero
+# cueste menos del 2% del paso, a cambio de detectar el ciclo un poco más tarde.
+auto_stop = True
+telemetry = LifeTelemetry(cells, every=64)
 
 # Crear escena que ocupe toda la ventana
 scene = canvas(title='Juego de la Vida de Conway 3D Mejorado', width=900, height=900)
@@ -20,59 +31,49 @@ scene.userspin = True
 def get_color(z):
     return vector(z/size, 0.5, 1 - z/size)
 
-# Inicialización de voxels
-voxels = [[[None for _ in range(size)] for _ in range(size)] for _ in range(size)]
+# Escena de voxels: sólo se actualizan las celdas que cambian
+def create_voxel(x, y, z, scale):
+    return box(pos=vector(x, y, z), size=vector(0.8, 0.8, 0.8) * scale, color=get_color(z))
+
+def place_voxel(voxel, x, y, z, scale):
+    voxel.pos = vector(x, y, z)
+    voxel.size = vector(0.8, 0.8, 0.8) * scale
+    voxel.color = get_color(z)
+    voxel.visible = True
+
+voxel_scene = VoxelScene(create_voxel, place_voxel)
 
 # Variables para reglas personalizables
 survival_min = 4
 survival_max = 6
 birth_count = 4
 
+# Regla compilada a tabla; cambiarla no hace más lento el paso
+rule = rules.Rule({birth_count}, range(survival_min, survival_max + 1), dims=3)
+
 def initialize_grid():
-    global cells, voxels
-    cells = np.random.choice([0, 1], size=(size, size, size), p=[1-initial_density.value, initial_density.value])
+    global cells
+    cells = np.random.choice([0, 1], size=(size, size, size), p=[1-initial_density.value, initial_density.value]).astype(np.uint8)
+    telemetry.reset(cells)
     update_voxels()
 
 def update_voxels():
-    for x in range(size):
-        for y in range(size):
-            for z in range(size):
-                if cells[x][y][z] == 1:
-                    if voxels[x][y][z] is None:
-                        voxels[x][y][z] = box(pos=vector(x, y, z), 
-                                              size=vector(0.8,0.8,0.8), 
-                                              color=get_color(z))
-                    else:
-                        voxels[x][y][z].visible = True
-                elif voxels[x][y][z] is not None:
-                    voxels[x][y][z].visible = False
-
-def count_neighbors(x, y, z):
-    count = 0
-    for dx in [-1, 0, 1]:
-        for dy in [-1, 0, 1]:
-            for dz in [-1, 0, 1]:
-                if dx == 0 and dy == 0 and dz == 0:
-                    continue
-                nx, ny, nz = (x+dx)%size, (y+dy)%size, (z+dz)%size
-                count += cells[nx][ny][nz]
-    return count
-
-def update():
-    global cells
-    new_cells = np.zeros((size, size, size))
-    for x in range(size):
-        for y in range(size):
-            for z in range(size):
-                neighbors = count_neighbors(x, y, z)
-                if cells[x][y][z] == 1:
-                    if survival_min <= neighbors <= survival_max:  # Regla de supervivencia
-                        new_cells[x][y][z] = 1
-                else:
-                    if neighbors == birth_count:  # Regla de nacimiento
-                        new_cells[x][y][z] = 1
-    
-    cells = new_cells
+    voxel_scene.sync(cells)
+
+def update(steps=1):
+    global cells, running
+    settled = telemetry.settled
+    for _ in range(steps):
+        cells = life3d.step(cells, rule=rule)
+        telemetry.observe(cells)
+        if auto_stop and telemetry.settled and not settled:
+            running = False
+            pause_button.text = 'Reanudar'
+            if telemetry.extinct:
+                print(f'Generación {telemetry.generation}: no quedan celdas vivas')
+            else:
+                print(f'Generación {telemetry.generation}: ciclo de período {telemetry.period}')
+            break
     update_voxels()
 
 # UI para controles
@@ -104,18 +105,47 @@ scene.append_to_caption('Número de vecinos para nacer: ')
 birth_count_slider = slider(min=1, max=26, step=1, value=birth_count, bind=None)
 
 def update_rules(ev):
-    global survival_min, survival_max, birth_count
+    global survival_min, survival_max, birth_count, rule
     survival_min = int(survival_min_slider.value)
     survival_max = int(survival_max_slider.value)
     birth_count = int(birth_count_slider.value)
+    rule = rules.Rule({birth_count}, range(survival_min, survival_max + 1), dims=3)
+    rule_input.text = str(rule)
 
 button(text="Aplicar Reglas", bind=update_rules)
 
+# Cualquier regla en notación B/S, p. ej. 'B4,5/S2-6,9' o 'B4/S3,4/NV/R2'
+def apply_rulestring(w):
+    global rule
+    try:
+        rule = rules.parse(w.text, dims=3)
+    except ValueError as e:
+        print(e)
+        return
+    w.text = str(rule)
+
+scene.append_to_caption('\n\nRegla: ')
+rule_input = winput(bind=apply_rulestring, text=str(rule), width=200)
+
 # Inicialización
 initialize_grid()
 
+# Pasos de simulación por segundo, independientes de los cuadros dibujados
+steps_per_sec = 4
+fps = 30
+# Tope de pasos por cuadro: si el motor no alcanza steps_per_sec, la
+# simulación se hace más lenta en lugar de acumular atraso. Los pasos que no
+# entran se descartan: un cuadro (paso más dibujo) que tarde más de
+# max_steps_per_frame / steps_per_sec = 1 s pierde pasos, no sólo cuadros
+max_steps_per_frame = 4
+scheduler = FixedStep(steps_per_sec, max_steps_per_frame)
+
 # Bucle principal
 while True:
-    rate(4)  # Actualizamos 10 veces por segundo
+    rate(fps)
     if running:
-        update()
\ No newline at end of file
+        steps = scheduler.due()
+        if steps:
+            update(steps)
+    else:
+        scheduler.reset()
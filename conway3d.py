@@ -1,10 +1,28 @@
 import numpy as np
+import life3d
+import rules
+from bricks3d import BrickLife3D
+from scheduler import FixedStep
+from telemetry import LifeTelemetry
+from voxel_scene import VoxelScene
 from vpython import *
 import random
 
 # Configuración
 size = 30
-cells = np.zeros((size, size, size))
+cells = np.zeros((size, size, size), dtype=np.uint8)
+
+# Almacenamiento: 'dense' (un arreglo size^3) o 'bricks' (sólo los ladrillos de
+# brick^3 con celdas vivas; brick debe dividir a size)
+backend = 'dense'
+brick = 10
+board = None
+
+# Población y detección de ciclos; con auto_stop se pausa al morir o repetirse.
+# Se observa una generación de cada 64 para que comparar el tablero entero
+# cueste menos del 2% del paso, a cambio de detectar el ciclo un poco más tarde.
+auto_stop = True
+telemetry = LifeTelemetry(cells, every=64)
 
 # Crear escena
 scene = canvas(title='Juego de la Vida de Conway 3D Mejorado', width=800, height=600)
@@ -15,54 +33,49 @@ scene.camera.axis = vector(-size/2, -size/2, -size*2)
 def get_color(z):
     return vector(z/size, 0.5, 1 - z/size)
 
-# Inicialización de voxels
-voxels = [[[None for _ in range(size)] for _ in range(size)] for _ in range(size)]
+# Escena de voxels: sólo se actualizan las celdas que cambian
+def create_voxel(x, y, z, scale):
+    return box(pos=vector(x, y, z), size=vector(0.8, 0.8, 0.8) * scale, color=get_color(z))
+
+def place_voxel(voxel, x, y, z, scale):
+    voxel.pos = vector(x, y, z)
+    voxel.size = vector(0.8, 0.8, 0.8) * scale
+    voxel.color = get_color(z)
+    voxel.visible = True
+
+voxel_scene = VoxelScene(create_voxel, place_voxel)
+
+# Nace con 4 vecinos, sobrevive con 4 a 6 (la tabla se compila una sola vez)
+rule = rules.parse('B4/S4-6/3D')
 
 def initialize_grid():
-    global cells, voxels
-    cells = np.random.choice([0, 1], size=(size, size, size))
+    global cells, board
+    cells = np.random.choice([0, 1], size=(size, size, size)).astype(np.uint8)
+    if backend == 'bricks':
+        board = BrickLife3D.from_array(cells, brick, rule)
+    telemetry.reset(cells)
     update_voxels()
 
 def update_voxels():
-    for x in range(size):
-        for y in range(size):
-            for z in range(size):
-                if cells[x][y][z] == 1:
-                    if voxels[x][y][z] is None:
-                        voxels[x][y][z] = box(pos=vector(x, y, z), 
-                                              size=vector(0.8,0.8,0.8), 
-                                              color=get_color(z))
-                    else:
-                        voxels[x][y][z].visible = True
-                elif voxels[x][y][z] is not None:
-                    voxels[x][y][z].visible = False
-
-def count_neighbors(x, y, z):
-    count = 0
-    for dx in [-1, 0, 1]:
-        for dy in [-1, 0, 1]:
-            for dz in [-1, 0, 1]:
-                if dx == 0 and dy == 0 and dz == 0:
-                    continue
-                nx, ny, nz = (x+dx)%size, (y+dy)%size, (z+dz)%size
-                count += cells[nx][ny][nz]
-    return count
-
-def update():
-    global cells
-    new_cells = np.zeros((size, size, size))
-    for x in range(size):
-        for y in range(size):
-            for z in range(size):
-                neighbors = count_neighbors(x, y, z)
-                if cells[x][y][z] == 1:
-                    if 4 <= neighbors <= 6:  # Regla de supervivencia
-                        new_cells[x][y][z] = 1
-                else:
-                    if neighbors == 4:  # Regla de nacimiento
-                        new_cells[x][y][z] = 1
-    
-    cells = new_cells
+    voxel_scene.sync(cells)
+
+def update(steps=1):
+    global cells, running
+    settled = telemetry.settled
+    for _ in range(steps):
+        if board is not None:
+            cells = board.step().to_array()
+        else:
+            cells = life3d.step(cells, rule=rule)
+        telemetry.observe(cells)
+        if auto_stop and telemetry.settled and not settled:
+            running = False
+            pause_button.text = 'Reanudar'
+            if telemetry.extinct:
+                print(f'Generación {telemetry.generation}: no quedan celdas vivas')
+            else:
+                print(f'Generación {telemetry.generation}: ciclo de período {telemetry.period}')
+            break
     update_voxels()
 
 # Crear botón para reiniciar
@@ -88,8 +101,22 @@ pause_button = button(bind=toggle_pause, text='Pausar', pos=scene.title_anchor)
 scene.userzoom = True
 scene.userspin = True
 
+# Pasos de simulación por segundo, independientes de los cuadros dibujados
+steps_per_sec = 10
+fps = 30
+# Tope de pasos por cuadro: si el motor no alcanza steps_per_sec, la
+# simulación se hace más lenta en lugar de acumular atraso. Los pasos que no
+# entran se descartan: un cuadro (paso más dibujo) que tarde más de
+# max_steps_per_frame / steps_per_sec = 0,4 s pierde pasos, no sólo cuadros
+max_steps_per_frame = 4
+scheduler = FixedStep(steps_per_sec, max_steps_per_frame)
+
 # Bucle principal
 while True:
-    rate(10)  # Actualizamos 10 veces por segundo
+    rate(fps)
     if running:
-        update()
\ No newline at end of file
+        steps = scheduler.due()
+        if steps:
+            update(steps)
+    else:
+        scheduler.reset()
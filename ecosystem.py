@@ -0,0 +1,372 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from rng import RandomStream
+import profiling
+
+# Stream used by organisms created without an explicit one
+default_rng = RandomStream()
+
+class Organism(ABC):
+    def __init__(self, x, y, energy, rng=None):
+        self.rng = rng if rng is not None else default_rng
+        self.x = x
+        self.y = y
+        self.energy = energy
+        self.age = 0
+
+    @abstractmethod
+    def update(self, world):
+        pass
+
+    @abstractmethod
+    def reproduce(self):
+        pass
+
+class Plant(Organism):
+    species_code = 0
+    initial_energy = 50
+    max_energy = 100
+    growth_range = (0.1, 0.3)
+    reproduce_threshold = 80
+    reproduce_chance = 0.1
+    reproduce_cost = 30
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x, y, self.initial_energy, rng)
+        self.growth_rate = self.rng.uniform(*self.growth_range)
+
+    def update(self, world):
+        self.energy += self.growth_rate * world.sunlight
+        self.age += 1
+        if self.energy > self.max_energy:
+            self.energy = self.max_energy
+
+    def reproduce(self):
+        if self.energy > self.reproduce_threshold and self.rng.random() < self.reproduce_chance:
+            self.energy -= self.reproduce_cost
+            return Plant(self.x + self.rng.randint(-1, 1), self.y + self.rng.randint(-1, 1), self.rng)
+        return None
+
+class Animal(Organism):
+    initial_energy = 100
+
+    def __init__(self, x, y, speed, sense_range, rng=None):
+        super().__init__(x, y, self.initial_energy, rng)
+        self.speed = speed
+        self.sense_range = sense_range
+
+    def move(self, world):
+        dx, dy = self.rng.randint(-self.speed, self.speed), self.rng.randint(-self.speed, self.speed)
+        old_x, old_y = self.x, self.y
+        self.x = (self.x + dx) % world.width
+        self.y = (self.y + dy) % world.height
+        world.moved(self, old_x, old_y)
+
+    def find_food(self, world):
+        return world.find_nearest(self.food_type, self.x, self.y, self.sense_range)
+
+    def eat(self, food):
+        self.energy += food.energy
+        food.energy = 0
+
+    def update(self, world):
+        self.age += 1
+        self.energy -= 1
+        food = self.find_food(world)
+        if food:
+            self.eat(food)
+        else:
+            self.move(world)
+
+    @abstractmethod
+    def reproduce(self):
+        pass
+
+class Herbivore(Animal):
+    species_code = 1
+    food_type = Plant
+    speed = 2
+    sense_range = 5
+    reproduce_threshold = 150
+    reproduce_chance = 0.05
+    reproduce_cost = 50
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x, y, speed=self.speed, sense_range=self.sense_range, rng=rng)
+
+    def reproduce(self):
+        if self.energy > self.reproduce_threshold and self.rng.random() < self.reproduce_chance:
+            self.energy -= self.reproduce_cost
+            return Herbivore(self.x, self.y, self.rng)
+        return None
+
+class Carnivore(Animal):
+    species_code = 2
+    food_type = Herbivore
+    speed = 3
+    sense_range = 7
+    reproduce_threshold = 200
+    reproduce_chance = 0.03
+    reproduce_cost = 70
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x, y, speed=self.speed, sense_range=self.sense_range, rng=rng)
+
+    def reproduce(self):
+        if self.energy > self.reproduce_threshold and self.rng.random() < self.reproduce_chance:
+            self.energy -= self.reproduce_cost
+            return Carnivore(self.x, self.y, self.rng)
+        return None
+
+# Uniform bucket grid over the toroidal world for nearest-food queries
+class SpatialHash:
+    def __init__(self, width, height, cell_size):
+        self.width = width
+        self.height = height
+        # Buckets tile the torus evenly, so each one is at least cell_size wide
+        self.cols = max(1, int(width // cell_size))
+        self.rows = max(1, int(height // cell_size))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        # Buckets are insertion-ordered dicts so ties resolve the same way every run
+        self.buckets = {}
+
+    def _cell(self, x, y):
+        return (int((x % self.width) // self.cell_width) % self.cols,
+                int((y % self.height) // self.cell_height) % self.rows)
+
+    def insert(self, organism):
+        self.buckets.setdefault(self._cell(organism.x, organism.y), {})[organism] = None
+
+    def remove(self, organism, x=None, y=None):
+        cell = self._cell(organism.x if x is None else x, organism.y if y is None else y)
+        bucket = self.buckets.get(cell)
+        if bucket is not None:
+            bucket.pop(organism, None)
+
+    def move(self, organism, old_x, old_y):
+        old, new = self._cell(old_x, old_y), self._cell(organism.x, organism.y)
+        if old != new:
+            self.remove(organism, old_x, old_y)
+            self.insert(organism)
+
+    def _span(self, centre, reach, count):
+        # Bucket indices within reach of centre, each visited once even on tiny grids
+        if 2 * reach + 1 >= count:
+            return range(count)
+        return [(centre + offset) % count for offset in range(-reach, reach + 1)]
+
+    def nearest(self, x, y, radius):
+        # (squared distance, organism) of the closest live organism within radius
+        cx, cy = self._cell(x, y)
+        reach_x = int(np.ceil(radius / self.cell_width))
+        reach_y = int(np.ceil(radius / self.cell_height))
+        half_w, half_h = self.width / 2, self.height / 2
+        best, best_d2 = None, radius * radius
+        for i in self._span(cx, reach_x, self.cols):
+            for j in self._span(cy, reach_y, self.rows):
+                for organism in self.buckets.get((i, j), ()):
+                    if organism.energy <= 0:
+                        continue
+                    dx = (organism.x - x + half_w) % self.width - half_w
+                    dy = (organism.y - y + half_h) % self.height - half_h
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2:
+                        best, best_d2 = organism, d2
+        return (best_d2, best) if best is not None else None
+
+# Plants as a height x width float32 energy raster instead of Plant objects:
+# a cell with energy > 0 holds one plant. Growth, the energy cap and spreading
+# to a neighbouring cell run as whole-array operations, so a tick costs the same
+# however many plants there are, and plants no longer stack on one cell.
+class PlantField:
+    def __init__(self, width, height, rng):
+        self.width = width
+        self.height = height
+        self.generator = rng.generator
+        # Indexed [y, x]; each cell keeps the growth rate of the plant seeded there
+        self.energy = np.zeros((height, width), dtype=np.float32)
+        self.growth_rate = np.zeros((height, width), dtype=np.float32)
+        self._offsets = {}
+
+    def seed(self, x, y, energy=None):
+        # New plants on cells (x, y) with energy (default Plant.initial_energy,
+        # read per call so overridden class attributes apply); cells that
+        # already hold a plant keep it. Returns how many plants were added.
+        if energy is None:
+            energy = Plant.initial_energy
+        x = np.asarray(x, dtype=np.int64) % self.width
+        y = np.asarray(y, dtype=np.int64) % self.height
+        empty = self.energy[y, x] <= 0
+        x, y = x[empty], y[empty]
+        # Several seeds on one empty cell make a single plant
+        cells = np.unique(y * self.width + x)
+        y, x = np.divmod(cells, self.width)
+        self.energy[y, x] = energy
+        self.growth_rate[y, x] = self.generator.uniform(*Plant.growth_range, len(cells))
+        return len(cells)
+
+    def count(self):
+        return int(np.count_nonzero(self.energy > 0))
+
+    def cells(self):
+        # (x, y) of every plant
+        y, x = np.nonzero(self.energy > 0)
+        return x, y
+
+    def update(self, sunlight):
+        # Plant.update and Plant.reproduce for every cell at once
+        energy = self.energy
+        alive = energy > 0
+        energy += self.growth_rate * np.float32(sunlight) * alive
+        np.minimum(energy, Plant.max_energy, out=energy)
+        y, x = np.nonzero(energy > Plant.reproduce_threshold)
+        parents = self.generator.random(len(y)) < Plant.reproduce_chance
+        y, x = y[parents], x[parents]
+        energy[y, x] -= Plant.reproduce_cost
+        return self.seed(x + self.generator.integers(-1, 2, len(x)), y + self.generator.integers(-1, 2, len(y)))
+
+    def _offsets_within(self, radius):
+        # Cell offsets closer than radius, nearest first
+        offsets = self._offsets.get(radius)
+        if offsets is None:
+            reach = int(np.ceil(radius))
+            dy, dx = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+            d2 = (dx * dx + dy * dy).ravel()
+            order = np.argsort(d2, kind='stable')
+            order = order[d2[order] < radius * radius]
+            offsets = self._offsets[radius] = (dx.ravel()[order], dy.ravel()[order])
+        return offsets
+
+    def nearest(self, x, y, radius):
+        # Closest plant within radius of (x, y), as a PlantCell, or None
+        dx, dy = self._offsets_within(radius)
+        xs = (int(x) + dx) % self.width
+        ys = (int(y) + dy) % self.height
+        found = np.flatnonzero(self.energy[ys, xs] > 0)
+        if not len(found):
+            return None
+        return PlantCell(self, xs[found[0]], ys[found[0]])
+
+class PlantCell:
+    # One raster cell seen as a plant, so Animal.eat works unchanged
+    species_code = Plant.species_code
+
+    def __init__(self, field, x, y):
+        self.field = field
+        self.x = x
+        self.y = y
+
+    @property
+    def energy(self):
+        return float(self.field.energy[self.y, self.x])
+
+    @energy.setter
+    def energy(self, value):
+        self.field.energy[self.y, self.x] = value
+
+class World:
+    index_cell_size = 5
+
+    def __init__(self, width, height, seed=None, plant_field=False):
+        self.width = width
+        self.height = height
+        self.rng = RandomStream(seed)
+        self.organisms = []
+        self.sunlight = 1.0
+        self.time = 0
+        self.index = {}
+        # With plant_field, plants live in a PlantField raster instead of organisms
+        self.plants = PlantField(width, height, self.rng.spawn('plants')) if plant_field else None
+        # profiling.Profiler() to time each phase of update()
+        self.profiler = profiling.NULL
+
+    def build_index(self):
+        self.index = {}
+        for organism in self.organisms:
+            grid = self.index.get(type(organism))
+            if grid is None:
+                grid = self.index[type(organism)] = SpatialHash(self.width, self.height, self.index_cell_size)
+            grid.insert(organism)
+
+    def moved(self, organism, old_x, old_y):
+        grid = self.index.get(type(organism))
+        if grid is not None:
+            grid.move(organism, old_x, old_y)
+
+    def find_nearest(self, food_type, x, y, radius):
+        if self.plants is not None and food_type is Plant:
+            return self.plants.nearest(x, y, radius)
+        best = None
+        for cls, grid in self.index.items():
+            if issubclass(cls, food_type):
+                found = grid.nearest(x, y, radius)
+                if found is not None and (best is None or found[0] < best[0]):
+                    best = found
+        return best[1] if best is not None else None
+
+    def add_organism(self, organism):
+        if self.plants is not None and isinstance(organism, Plant):
+            self.plants.seed([organism.x], [organism.y], organism.energy)
+        else:
+            self.organisms.append(organism)
+
+    def count(self, species):
+        if self.plants is not None and species is Plant:
+            return self.plants.count()
+        return sum(1 for org in self.organisms if isinstance(org, species))
+
+    def populations(self):
+        return {species.__name__: self.count(species) for species in (Plant, Herbivore, Carnivore)}
+
+    def positions(self):
+        # x, y and species_code arrays of all organisms, filled in a single pass
+        records = np.fromiter(((org.x, org.y, org.species_code) for org in self.organisms),
+                              dtype=[('x', np.float64), ('y', np.float64), ('code', np.uint8)],
+                              count=len(self.organisms))
+        if self.plants is None:
+            return records['x'], records['y'], records['code']
+        x, y = self.plants.cells()
+        return (np.concatenate([x, records['x']]), np.concatenate([y, records['y']]),
+                np.concatenate([np.full(len(x), Plant.species_code, dtype=np.uint8), records['code']]))
+
+    def remove_dead_organisms(self):
+        self.organisms = [org for org in self.organisms if org.energy > 0]
+
+    # Phases of update(), in order
+
+    def update_environment(self):
+        self.time += 1
+        self.sunlight = 0.5 + 0.5 * np.sin(self.time / 50)  # Day-night cycle
+
+    def update_organisms(self):
+        for organism in self.organisms:
+            organism.update(self)
+
+    def reproduce_organisms(self):
+        new_organisms = []
+        for organism in self.organisms:
+            child = organism.reproduce()
+            if child:
+                new_organisms.append(child)
+        return new_organisms
+
+    def update(self):
+        profiler = self.profiler
+        profiler.begin_tick(self)
+        with profiler.phase('environment'):
+            self.update_environment()
+        with profiler.phase('index', len(self.organisms)):
+            self.build_index()
+        if self.plants is not None:
+            with profiler.phase('plants', self.plants.energy.size):
+                self.plants.update(self.sunlight)
+        with profiler.phase('organisms', len(self.organisms)):
+            self.update_organisms()
+        with profiler.phase('reproduce', len(self.organisms)):
+            new_organisms = self.reproduce_organisms()
+        with profiler.phase('extend', len(new_organisms)):
+            self.organisms.extend(new_organisms)
+        with profiler.phase('remove_dead', len(self.organisms)):
+            self.remove_dead_organisms()
+        profiler.end_tick(self)
\ No newline at end of file
@@ -0,0 +1,68 @@
+import numpy as np
+from matplotlib.colors import to_rgba_array
+
+# Matplotlib views of the ecosystem fed from the (x, y, species_code) arrays
+# returned by World.positions / ArrayWorld.positions. Colours are looked up by
+# species code in a small RGBA table, and the per-frame work is a few array
+# copies into buffers kept between frames.
+
+# RGBA per species_code: plants, herbivores, carnivores
+SPECIES_COLORS = to_rgba_array(['g', 'b', 'r'])
+
+
+class ScatterView:
+    def __init__(self, ax, capacity=1024, colors=SPECIES_COLORS, size=None):
+        self.colors = np.asarray(colors, dtype=np.float64)
+        self.offsets = np.zeros((capacity, 2))
+        self.rgba = np.zeros((capacity, 4))
+        self.artist = ax.scatter([], [], s=size)
+        self.count = 0
+
+    def _reserve(self, n):
+        # Grows the buffers by doubling, so resizes are rare
+        capacity = len(self.offsets)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        self.offsets = np.resize(self.offsets, (capacity, 2))
+        self.rgba = np.resize(self.rgba, (capacity, 4))
+
+    def update(self, x, y, codes):
+        n = len(x)
+        self._reserve(n)
+        self.offsets[:n, 0] = x
+        self.offsets[:n, 1] = y
+        np.take(self.colors, codes, axis=0, out=self.rgba[:n])
+        self.count = n
+        self.artist.set_offsets(self.offsets[:n])
+        self.artist.set_facecolor(self.rgba[:n])
+        return self.artist,
+
+
+class HeatmapView:
+    # Density of each species binned on a bins x bins grid and shown as one
+    # image, each species tinting its own colour. For populations too large to
+    # draw point by point.
+
+    def __init__(self, ax, width, height, bins=50, colors=SPECIES_COLORS):
+        self.width = width
+        self.height = height
+        self.bins = bins
+        self.colors = np.asarray(colors, dtype=np.float64)[:, :3]
+        self.image = np.zeros((bins, bins, 3))
+        self.artist = ax.imshow(self.image, origin='lower', extent=(0, width, 0, height),
+                                interpolation='nearest', aspect='auto')
+
+    def update(self, x, y, codes):
+        bins, species = self.bins, len(self.colors)
+        bx = np.clip((np.asarray(x) * (bins / self.width)).astype(np.int64), 0, bins - 1)
+        by = np.clip((np.asarray(y) * (bins / self.height)).astype(np.int64), 0, bins - 1)
+        counts = np.bincount((codes.astype(np.int64) * bins + by) * bins + bx,
+                             minlength=species * bins * bins).reshape(species, bins * bins).astype(np.float64)
+        # Each species scaled to its own peak so a sparse one is still visible
+        counts /= np.maximum(counts.max(axis=1, keepdims=True), 1)
+        np.matmul(counts.T, self.colors, out=self.image.reshape(bins * bins, 3))
+        np.clip(self.image, 0, 1, out=self.image)
+        self.artist.set_data(self.image)
+        return self.artist,
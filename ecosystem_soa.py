@@ -0,0 +1,249 @@
+import numpy as np
+
+from ecosystem import Plant, Herbivore, Carnivore
+from rng import RandomStream
+
+# Struct-of-arrays backend for the ecosystem: every species keeps its organisms
+# in typed NumPy columns and each phase of World.update runs as array operations.
+
+SPECIES = (Plant, Herbivore, Carnivore)
+
+
+def _empty_columns():
+    return {
+        'x': np.zeros(0, dtype=np.int64),
+        'y': np.zeros(0, dtype=np.int64),
+        'energy': np.zeros(0, dtype=np.float64),
+        'age': np.zeros(0, dtype=np.int64),
+        'growth_rate': np.zeros(0, dtype=np.float32),
+    }
+
+
+def _column(name):
+    def get(self):
+        return self._columns[name][self._index].item()
+
+    def set(self, value):
+        self._columns[name][self._index] = value
+
+    return property(get, set)
+
+
+class _ColumnView:
+    # Organism proxy reading and writing one row of the species columns.
+    # Views are only valid until the next ArrayWorld.update().
+    x = _column('x')
+    y = _column('y')
+    energy = _column('energy')
+    age = _column('age')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+
+class PlantView(_ColumnView, Plant):
+    growth_rate = _column('growth_rate')
+
+
+class HerbivoreView(_ColumnView, Herbivore):
+    pass
+
+
+class CarnivoreView(_ColumnView, Carnivore):
+    pass
+
+
+VIEWS = {Plant: PlantView, Herbivore: HerbivoreView, Carnivore: CarnivoreView}
+
+
+class ArrayWorld:
+    index_cell_size = 5
+
+    def __init__(self, width, height, seed=None):
+        self.width = width
+        self.height = height
+        self.sunlight = 1.0
+        self.time = 0
+        self.rng = RandomStream(seed)
+        self.generator = self.rng.generator
+        self.columns = {species: _empty_columns() for species in SPECIES}
+
+    # --- object API ---
+
+    def add_organism(self, organism):
+        species = next(s for s in SPECIES if isinstance(organism, s))
+        self._append(species, [organism.x], [organism.y], [organism.energy], [organism.age],
+                     [getattr(organism, 'growth_rate', 0.0)])
+
+    @property
+    def organisms(self):
+        views = []
+        for species in SPECIES:
+            columns = self.columns[species]
+            view = VIEWS[species]
+            views.extend(view(columns, i) for i in range(len(columns['x'])))
+        return views
+
+    def count(self, species):
+        return len(self.columns[species]['x'])
+
+    def populations(self):
+        return {species.__name__: self.count(species) for species in SPECIES}
+
+    def positions(self):
+        # Same layout as World.positions, straight from the columns
+        x = np.concatenate([self.columns[species]['x'] for species in SPECIES])
+        y = np.concatenate([self.columns[species]['y'] for species in SPECIES])
+        codes = np.repeat(np.array([species.species_code for species in SPECIES], dtype=np.uint8),
+                          [self.count(species) for species in SPECIES])
+        return x, y, codes
+
+    def spawn(self, species, count):
+        # Places count new organisms at random positions
+        x = self.generator.integers(0, self.width, count)
+        y = self.generator.integers(0, self.height, count)
+        self._append(species, x, y, np.full(count, float(species.initial_energy)), np.zeros(count),
+                     self._growth_rates(species, count))
+
+    # --- columns ---
+
+    def _append(self, species, x, y, energy, age, growth_rate):
+        columns = self.columns[species]
+        for name, values in (('x', x), ('y', y), ('energy', energy), ('age', age),
+                             ('growth_rate', growth_rate)):
+            columns[name] = np.concatenate([columns[name], np.asarray(values, dtype=columns[name].dtype)])
+
+    def _keep(self, species, mask):
+        columns = self.columns[species]
+        for name in columns:
+            columns[name] = columns[name][mask]
+
+    def _growth_rates(self, species, count):
+        if species is Plant:
+            return self.generator.uniform(*Plant.growth_range, count)
+        return np.zeros(count)
+
+    # --- phases ---
+
+    def _grow_plants(self):
+        plants = self.columns[Plant]
+        plants['energy'] += plants['growth_rate'] * self.sunlight
+        np.minimum(plants['energy'], Plant.max_energy, out=plants['energy'])
+        plants['age'] += 1
+
+    def _nearest_prey(self, hunters, idx, prey, radius):
+        # For each hunter in idx, the index of the nearest live prey within radius (or -1)
+        result = np.full(len(idx), -1)
+        alive = np.flatnonzero(prey['energy'] > 0)
+        if len(idx) == 0 or len(alive) == 0:
+            return result
+
+        cols = max(1, int(self.width // self.index_cell_size))
+        rows = max(1, int(self.height // self.index_cell_size))
+        cell_w, cell_h = self.width / cols, self.height / rows
+
+        def cell_of(x, y):
+            cx = ((x % self.width) // cell_w).astype(np.int64) % cols
+            cy = ((y % self.height) // cell_h).astype(np.int64) % rows
+            return cx, cy
+
+        # Live prey sorted by bucket, with the start of each bucket
+        pcx, pcy = cell_of(prey['x'][alive], prey['y'][alive])
+        order = np.argsort(pcy * cols + pcx, kind='stable')
+        sorted_prey = alive[order]
+        starts = np.searchsorted((pcy * cols + pcx)[order], np.arange(cols * rows + 1))
+
+        # Every (hunter, bucket) pair within reach of the sense radius
+        hx, hy = hunters['x'][idx], hunters['y'][idx]
+        hcx, hcy = cell_of(hx, hy)
+        off_x = np.unique(np.arange(-int(np.ceil(radius / cell_w)), int(np.ceil(radius / cell_w)) + 1) % cols)
+        off_y = np.unique(np.arange(-int(np.ceil(radius / cell_h)), int(np.ceil(radius / cell_h)) + 1) % rows)
+        cells = (((hcy[:, None, None] + off_y[None, :, None]) % rows) * cols
+                 + (hcx[:, None, None] + off_x[None, None, :]) % cols).reshape(len(idx), -1)
+        lo, hi = starts[cells].ravel(), starts[cells + 1].ravel()
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            return result
+
+        # Expand the pairs into flat (hunter, prey) candidate arrays
+        hunter = np.repeat(np.repeat(np.arange(len(idx)), cells.shape[1]), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = sorted_prey[np.repeat(lo, counts) + np.arange(total) - first]
+
+        half_w, half_h = self.width / 2, self.height / 2
+        dx = (prey['x'][candidate] - hx[hunter] + half_w) % self.width - half_w
+        dy = (prey['y'][candidate] - hy[hunter] + half_h) % self.height - half_h
+        d2 = dx * dx + dy * dy
+        close = d2 < radius * radius
+        hunter, candidate, d2 = hunter[close], candidate[close], d2[close]
+
+        # Closest candidate per hunter
+        order = np.lexsort((d2, hunter))
+        hunter, candidate = hunter[order], candidate[order]
+        found, first = np.unique(hunter, return_index=True)
+        result[found] = candidate[first]
+        return result
+
+    def _hunt(self, species, rounds=3):
+        hunters = self.columns[species]
+        prey = self.columns[species.food_type]
+        hunters['age'] += 1
+        hunters['energy'] -= 1
+
+        # Hunters that lose a prey to an earlier hunter search again, like the
+        # object model where a later animal no longer sees the eaten prey
+        pending = np.arange(len(hunters['x']))
+        hungry = []
+        for _ in range(rounds):
+            target = self._nearest_prey(hunters, pending, prey, species.sense_range)
+            has = target >= 0
+            hungry.append(pending[~has])
+            meals, first = np.unique(target[has], return_index=True)
+            eaters = pending[has][first]
+            hunters['energy'][eaters] += prey['energy'][meals]
+            prey['energy'][meals] = 0
+            lost = np.ones(int(has.sum()), dtype=bool)
+            lost[first] = False
+            pending = pending[has][lost]
+            if len(pending) == 0:
+                break
+        hungry.append(pending)
+        self._move(species, np.concatenate(hungry))
+
+    def _move(self, species, idx):
+        if len(idx) == 0:
+            return
+        hunters = self.columns[species]
+        speed = species.speed
+        hunters['x'][idx] = (hunters['x'][idx] + self.generator.integers(-speed, speed + 1, len(idx))) % self.width
+        hunters['y'][idx] = (hunters['y'][idx] + self.generator.integers(-speed, speed + 1, len(idx))) % self.height
+
+    def _reproduce(self, species):
+        columns = self.columns[species]
+        n = len(columns['x'])
+        parents = np.flatnonzero((columns['energy'] > species.reproduce_threshold)
+                                 & (self.generator.random(n) < species.reproduce_chance))
+        columns['energy'][parents] -= species.reproduce_cost
+        x, y = columns['x'][parents], columns['y'][parents]
+        if species is Plant:
+            x = x + self.generator.integers(-1, 2, len(parents))
+            y = y + self.generator.integers(-1, 2, len(parents))
+        count = len(parents)
+        return (x, y, np.full(count, float(species.initial_energy)), np.zeros(count),
+                self._growth_rates(species, count))
+
+    def update(self):
+        self.time += 1
+        self.sunlight = 0.5 + 0.5 * np.sin(self.time / 50)  # Day-night cycle
+
+        self._grow_plants()
+        for species in (Herbivore, Carnivore):
+            self._hunt(species)
+
+        children = {species: self._reproduce(species) for species in SPECIES}
+        for species, child_columns in children.items():
+            self._append(species, *child_columns)
+        for species in SPECIES:
+            self._keep(species, self.columns[species]['energy'] > 0)
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Hashlife: el plano se representa como un quadtree de nodos canónicos (dos
+# regiones iguales son el mismo objeto) y el resultado de avanzar cada nodo se
+# memoriza. Evoluciona sobre el plano infinito, sin bordes recortados.
+#
+# max_cache limita los resultados memorizados y max_nodes la tabla de nodos
+# canónicos (cada nodo cuesta unos 400 bytes contando su entrada en la tabla y
+# los resultados que lo retienen): al pasarse de max_nodes, advance() vacía la
+# memoria y conserva sólo los nodos alcanzables desde root.
+
+
+class Node:
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+ON = Node(0, None, None, None, None, 1)
+OFF = Node(0, None, None, None, None, 0)
+
+
+class HashLife:
+    def __init__(self, max_cache=1 << 20, max_nodes=1 << 19):
+        self.max_cache = max_cache
+        self.max_nodes = max_nodes
+        self.collections = 0
+        self._nodes = {}
+        self._empty = [OFF]
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.root = self.empty(3)
+        # Coordenadas (fila, columna) de la esquina superior izquierda de root
+        self.top = 0
+        self.left = 0
+        self.generation = 0
+
+    # --- construcción de nodos ---
+
+    def join(self, nw, ne, sw, se):
+        key = (id(nw), id(ne), id(sw), id(se))
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def _centre(self, node):
+        # Nodo de un nivel menos que ocupa el centro de node, sin avanzar en el tiempo
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _expand(self, node):
+        # Rodea node de espacio vacío, dejándolo en el centro de un nodo mayor
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    # --- evolución ---
+
+    def _life_4x4(self, node):
+        # Caso base: bloque 4x4 -> centro 2x2 tras una generación
+        cells = []
+        for left, right in ((node.nw, node.ne), (node.sw, node.se)):
+            cells.append((left.nw.population, left.ne.population, right.nw.population, right.ne.population))
+            cells.append((left.sw.population, left.se.population, right.sw.population, right.se.population))
+        out = []
+        for r in (1, 2):
+            for c in (1, 2):
+                total = sum(cells[rr][cc] for rr in (r - 1, r, r + 1) for cc in (c - 1, c, c + 1)) - cells[r][c]
+                out.append(ON if total == 3 or (total == 2 and cells[r][c]) else OFF)
+        return self.join(*out)
+
+    def _successor(self, node, j):
+        # Centro de node (un nivel menos) tras 2**j generaciones, j <= level - 2
+        if node.population == 0:
+            return node.nw
+        key = (id(node), j)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return result[1]
+        self.misses += 1
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            sub = min(j, node.level - 3)
+            c1 = self._successor(nw, sub)
+            c2 = self._successor(self.join(nw.ne, ne.nw, nw.se, ne.sw), sub)
+            c3 = self._successor(ne, sub)
+            c4 = self._successor(self.join(nw.sw, nw.se, sw.nw, sw.ne), sub)
+            c5 = self._successor(self.join(nw.se, ne.sw, sw.ne, se.nw), sub)
+            c6 = self._successor(self.join(ne.sw, ne.se, se.nw, se.ne), sub)
+            c7 = self._successor(sw, sub)
+            c8 = self._successor(self.join(sw.ne, se.nw, sw.se, se.sw), sub)
+            c9 = self._successor(se, sub)
+            quads = (self.join(c1, c2, c4, c5), self.join(c2, c3, c5, c6),
+                     self.join(c4, c5, c7, c8), self.join(c5, c6, c8, c9))
+            if j < node.level - 2:
+                # Los nueve hijos ya avanzaron 2**j: sólo falta recortar el centro
+                result = self.join(*(self._centre(q) for q in quads))
+            else:
+                result = self.join(*(self._successor(q, sub) for q in quads))
+
+        # Se guarda también el nodo para que su id no pueda reutilizarse
+        self._results[key] = (node, result)
+        if len(self._results) > self.max_cache:
+            self._results.popitem(last=False)
+        return result
+
+    def advance(self, k):
+        # Avanza exactamente 2**k generaciones
+        root = self.root
+        while root.level < k + 2:
+            root, self.top, self.left = self._pad(root)
+        # Dos niveles extra de vacío garantizan que el patrón no salga del resultado
+        for _ in range(2):
+            root, self.top, self.left = self._pad(root)
+        offset = 1 << (root.level - 2)
+        self.root = self._successor(root, k)
+        self.top += offset
+        self.left += offset
+        self.generation += 1 << k
+        self._shrink()
+        if len(self._nodes) > self.max_nodes:
+            self.clear_cache()
+            self.collections += 1
+
+    def step(self, generations):
+        # Avanza un número arbitrario de generaciones, usando su expansión binaria
+        k = 0
+        while generations:
+            if generations & 1:
+                self.advance(k)
+            generations >>= 1
+            k += 1
+
+    def _pad(self, root):
+        half = 1 << (root.level - 1)
+        return self._expand(root), self.top - half, self.left - half
+
+    def _shrink(self):
+        # Quita niveles vacíos alrededor del patrón para que root no crezca sin límite
+        root = self.root
+        while root.level > 3:
+            centre = self._centre(root)
+            if centre.population != root.population:
+                break
+            quarter = 1 << (root.level - 2)
+            self.top += quarter
+            self.left += quarter
+            root = centre
+        self.root = root
+
+    # --- conversión desde y hacia arreglos numpy ---
+
+    def _build(self, cells, level):
+        if level == 0:
+            return ON if cells[0, 0] else OFF
+        if not cells.any():
+            return self.empty(level)
+        h = 1 << (level - 1)
+        return self.join(self._build(cells[:h, :h], level - 1), self._build(cells[:h, h:], level - 1),
+                         self._build(cells[h:, :h], level - 1), self._build(cells[h:, h:], level - 1))
+
+    @classmethod
+    def from_array(cls, grid, max_cache=1 << 20, max_nodes=1 << 19):
+        life = cls(max_cache, max_nodes)
+        rows, cols = grid.shape
+        level = 3
+        while (1 << level) < max(rows, cols):
+            level += 1
+        cells = np.zeros((1 << level, 1 << level), dtype=np.uint8)
+        cells[:rows, :cols] = grid == 1
+        life.root = life._build(cells, level)
+        life._shrink()
+        return life
+
+    def _fill(self, node, out, top, left):
+        if node.population == 0:
+            return
+        size = 1 << node.level
+        rows, cols = out.shape
+        if top >= rows or left >= cols or top + size <= 0 or left + size <= 0:
+            return
+        if node.level == 0:
+            out[top, left] = 1
+            return
+        h = size >> 1
+        self._fill(node.nw, out, top, left)
+        self._fill(node.ne, out, top, left + h)
+        self._fill(node.sw, out, top + h, left)
+        self._fill(node.se, out, top + h, left + h)
+
+    def to_array(self, rows, cols, top=0, left=0, dtype=int):
+        # Ventana rows x cols del plano cuya esquina superior izquierda es (top, left)
+        out = np.zeros((rows, cols), dtype=dtype)
+        self._fill(self.root, out, self.top - top, self.left - left)
+        return out
+
+    # --- estadísticas ---
+
+    def population(self):
+        return self.root.population
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'generation': self.generation,
+            'population': self.root.population,
+            'nodes': len(self._nodes),
+            'cache_entries': len(self._results),
+            'collections': self.collections,
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear_cache(self):
+        # Vacía la memoria de resultados y conserva sólo los nodos alcanzables desde root
+        self._results.clear()
+        keep = {}
+        stack = [self.root] + self._empty
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (id(node.nw), id(node.ne), id(node.sw), id(node.se))
+            if key in keep:
+                continue
+            keep[key] = node
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+        self._nodes = keep
@@ -1,164 +1,54 @@
-import random
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
-import numpy as np
-from abc import ABC, abstractmethod
-
-class Organism(ABC):
-    def __init__(self, x, y, energy):
-        self.x = x
-        self.y = y
-        self.energy = energy
-        self.age = 0
-
-    @abstractmethod
-    def update(self, world):
-        pass
-
-    @abstractmethod
-    def reproduce(self):
-        pass
-
-class Plant(Organism):
-    def __init__(self, x, y):
-        super().__init__(x, y, 50)
-        self.growth_rate = random.uniform(0.1, 0.3)
-
-    def update(self, world):
-        self.energy += self.growth_rate * world.sunlight
-        self.age += 1
-        if self.energy > 100:
-            self.energy = 100
-
-    def reproduce(self):
-        if self.energy > 80 and random.random() < 0.1:
-            self.energy -= 30
-            return Plant(self.x + random.randint(-1, 1), self.y + random.randint(-1, 1))
-        return None
-
-class Animal(Organism):
-    def __init__(self, x, y, speed, sense_range):
-        super().__init__(x, y, 100)
-        self.speed = speed
-        self.sense_range = sense_range
-
-    def move(self, world):
-        dx, dy = random.randint(-self.speed, self.speed), random.randint(-self.speed, self.speed)
-        self.x = (self.x + dx) % world.width
-        self.y = (self.y + dy) % world.height
-
-    def find_food(self, world):
-        for organism in world.organisms:
-            if isinstance(organism, self.food_type):
-                distance = ((self.x - organism.x)**2 + (self.y - organism.y)**2)**0.5
-                if distance < self.sense_range:
-                    return organism
-        return None
-
-    def eat(self, food):
-        self.energy += food.energy
-        food.energy = 0
-
-    def update(self, world):
-        self.age += 1
-        self.energy -= 1
-        food = self.find_food(world)
-        if food:
-            self.eat(food)
-        else:
-            self.move(world)
-
-    @abstractmethod
-    def reproduce(self):
-        pass
-
-class Herbivore(Animal):
-    food_type = Plant
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=2, sense_range=5)
-
-    def reproduce(self):
-        if self.energy > 150 and random.random() < 0.05:
-            self.energy -= 50
-            return Herbivore(self.x, self.y)
-        return None
-
-class Carnivore(Animal):
-    food_type = Herbivore
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=3, sense_range=7)
-
-    def reproduce(self):
-        if self.energy > 200 and random.random() < 0.03:
-            self.energy -= 70
-            return Carnivore(self.x, self.y)
-        return None
-
-class World:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.organisms = []
-        self.sunlight = 1.0
-        self.time = 0
-
-    def add_organism(self, organism):
-        self.organisms.append(organism)
-
-    def remove_dead_organisms(self):
-        self.organisms = [org for org in self.organisms if org.energy > 0]
-
-    def update(self):
-        self.time += 1
-        self.sunlight = 0.5 + 0.5 * np.sin(self.time / 50)  # Day-night cycle
-
-        for organism in self.organisms:
-            organism.update(self)
-
-        new_organisms = []
-        for organism in self.organisms:
-            child = organism.reproduce()
-            if child:
-                new_organisms.append(child)
-
-        self.organisms.extend(new_organisms)
-        self.remove_dead_organisms()
+from ecosystem import Plant, Herbivore, Carnivore, World
+from ecosystem_render import HeatmapView, ScatterView
+from profiling import Profiler
 
 class Simulation:
-    def __init__(self, world_width, world_height):
-        self.world = World(world_width, world_height)
+    # view is 'scatter' (one point per organism) or 'heatmap' (binned density,
+    # for populations too large to scatter). With profile, the phases of every
+    # tick and the drawing are timed; the summary is printed when the window
+    # closes and trace_path gets a Chrome trace.
+    # plant_field keeps the plants in a raster (ecosystem.PlantField).
+    def __init__(self, world_width, world_height, seed=None, view='scatter', bins=50, profile=False,
+                 trace_path=None, memory_every=0, plant_field=False):
+        self.world = World(world_width, world_height, seed, plant_field)
+        if profile or trace_path:
+            self.world.profiler = Profiler(memory_every=memory_every)
+        self.trace_path = trace_path
         self.fig, self.ax = plt.subplots()
-        self.sc = self.ax.scatter([], [], c=[])
+        if view == 'heatmap':
+            self.view = HeatmapView(self.ax, world_width, world_height, bins)
+        elif view == 'scatter':
+            self.view = ScatterView(self.ax)
+        else:
+            raise ValueError(f"Unknown view: {view!r} (use 'scatter' or 'heatmap')")
         self.ax.set_xlim(0, world_width)
         self.ax.set_ylim(0, world_height)
 
     def initialize(self):
-        for _ in range(50):
-            self.world.add_organism(Plant(random.randint(0, self.world.width-1), 
-                                          random.randint(0, self.world.height-1)))
-        for _ in range(20):
-            self.world.add_organism(Herbivore(random.randint(0, self.world.width-1), 
-                                              random.randint(0, self.world.height-1)))
-        for _ in range(5):
-            self.world.add_organism(Carnivore(random.randint(0, self.world.width-1), 
-                                              random.randint(0, self.world.height-1)))
+        rng = self.world.rng
+        for cls, count in ((Plant, 50), (Herbivore, 20), (Carnivore, 5)):
+            for _ in range(count):
+                self.world.add_organism(cls(rng.randint(0, self.world.width-1),
+                                            rng.randint(0, self.world.height-1), rng))
 
     def update(self, frame):
         self.world.update()
-        x = [org.x for org in self.world.organisms]
-        y = [org.y for org in self.world.organisms]
-        colors = ['g' if isinstance(org, Plant) else 'b' if isinstance(org, Herbivore) else 'r' for org in self.world.organisms]
-        self.sc.set_offsets(np.c_[x, y])
-        self.sc.set_color(colors)
-        self.ax.set_title(f"Time: {self.world.time}, Sunlight: {self.world.sunlight:.2f}")
-        return self.sc,
+        with self.world.profiler.phase('render', len(self.world.organisms)):
+            artists = self.view.update(*self.world.positions())
+            self.ax.set_title(f"Time: {self.world.time}, Sunlight: {self.world.sunlight:.2f}")
+        return artists
 
     def run(self):
         self.initialize()
         anim = FuncAnimation(self.fig, self.update, frames=1000, interval=50, blit=True)
         plt.show()
+        profiler = self.world.profiler
+        if profiler.enabled:
+            print(profiler.format_summary())
+            if self.trace_path:
+                profiler.write_chrome_trace(self.trace_path)
 
 if __name__ == "__main__":
     simulation = Simulation(100, 100)
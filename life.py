@@ -0,0 +1,88 @@
+import functools
+
+import numpy as np
+
+import life_bits
+import rules
+
+# Motores de paso para el Juego de la Vida 2D (B3/S23 por defecto).
+# Todos reciben la grilla actual y devuelven una nueva del mismo dtype.
+
+
+def _pad(grid, wrap):
+    # Borde de un cero (bordes recortados) o copia del lado opuesto (toroide)
+    return np.pad(grid, 1, mode='wrap' if wrap else 'constant')
+
+
+def _count_padded(padded):
+    # Suma de los 8 vecinos usando vistas desplazadas del arreglo con borde
+    rows, cols = padded.shape[0] - 2, padded.shape[1] - 2
+    total = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr == 1 and dc == 1:
+                continue
+            total += padded[dr:dr + rows, dc:dc + cols]
+    return total
+
+
+def _step_padded(padded, dtype, rule=rules.CONWAY):
+    # Calcula la siguiente generación del interior de un bloque con borde de 1
+    # (padded debe ser uint8 de ceros y unos) con la tabla compilada de la regla
+    return rules.apply(rule, padded[1:-1, 1:-1], _count_padded(padded), dtype)
+
+
+def _check_rule(rule, dims=2):
+    # Los motores con borde de una celda sólo admiten la vecindad de Moore de radio 1
+    if rule.dims != dims or rule.neighborhood != 'M' or rule.radius != 1:
+        raise ValueError(f"Este motor sólo admite reglas {dims}D de Moore con radio 1, no {rule}")
+
+
+def count_neighbors(grid, wrap=False):
+    return _count_padded(_pad(grid.astype(np.uint8), wrap))
+
+
+def step(grid, wrap=False, rule=rules.CONWAY):
+    if rule.dims == 2 and rule.neighborhood == 'M' and rule.radius == 1:
+        return _step_padded(_pad(grid.astype(np.uint8), wrap), grid.dtype, rule)
+    # Radios mayores o von Neumann: conteo con filtros de caja
+    return rules.step(grid, rule, wrap)
+
+
+def step_loop(grid, wrap=False):
+    # Implementación original celda por celda, se conserva como referencia
+    rows, cols = grid.shape
+    new_grid = np.copy(grid)
+    for r in range(rows):
+        for c in range(cols):
+            if wrap:
+                total = np.sum(grid.take(range(r - 1, r + 2), axis=0, mode='wrap')
+                               .take(range(c - 1, c + 2), axis=1, mode='wrap'))
+            else:
+                total = np.sum(grid[max(0, r-1):min(rows, r+2), max(0, c-1):min(cols, c+2)])
+            if grid[r, c] == 1:
+                total -= 1
+                if total < 2 or total > 3:
+                    new_grid[r, c] = 0
+            elif total == 3:
+                new_grid[r, c] = 1
+    return new_grid
+
+
+ENGINES = {
+    'loop': step_loop,
+    'dense': step,
+    'bits': life_bits.step,
+}
+
+
+def get_engine(name, rule=rules.CONWAY):
+    try:
+        engine = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Motor desconocido: {name!r} (disponibles: {', '.join(ENGINES)})")
+    if rule == rules.CONWAY:
+        return engine
+    if engine is not step:
+        raise ValueError(f"El motor {name!r} sólo implementa B3/S23, usar 'dense' para {rule}")
+    return functools.partial(step, rule=rule)
@@ -0,0 +1,28 @@
+import numpy as np
+
+import rules
+
+# Paso vectorizado del Juego de la Vida 3D sobre un toroide, con vecindad de
+# Moore de 26 celdas y conjuntos arbitrarios de nacimiento y supervivencia.
+# Otras vecindades y radios (ver rules.py) se cuentan con filtros de caja.
+
+
+def count_neighbors(cells):
+    # Suma separable de la caja 3x3x3 (un eje a la vez) menos la celda central
+    live = (cells == 1).astype(np.uint8)
+    total = live.copy()
+    for axis in range(3):
+        total = np.roll(total, 1, axis=axis) + total + np.roll(total, -1, axis=axis)
+    return total - live
+
+
+def step(cells, birth=(4,), survival=(4, 5, 6), rule=None):
+    # Con rule (ya compilada) no se arma la tabla en cada paso
+    if rule is None:
+        rule = rules.Rule(birth, survival, dims=3)
+    if rule.dims != 3:
+        raise ValueError(f"La regla {rule} no es 3D")
+    if rule.neighborhood != 'M' or rule.radius != 1:
+        return rules.step(cells, rule, wrap=True)
+    alive = (cells == 1).astype(np.uint8)
+    return rules.apply(rule, alive, count_neighbors(cells), cells.dtype)
@@ -0,0 +1,140 @@
+import numpy as np
+
+# Grilla empaquetada: cada fila se guarda como palabras uint64, 64 celdas por
+# palabra. La columna c corresponde al bit c % 64 de la palabra c // 64.
+
+WORD_BITS = 64
+
+
+def words_per_row(cols):
+    return (cols + WORD_BITS - 1) // WORD_BITS
+
+
+def pack(grid):
+    rows, cols = grid.shape
+    nwords = words_per_row(cols)
+    bits = np.zeros((rows, nwords * WORD_BITS), dtype=np.uint8)
+    bits[:, :cols] = grid == 1
+    packed = np.packbits(bits, axis=1, bitorder='little')
+    return np.ascontiguousarray(packed).view('<u8').astype(np.uint64)
+
+
+def unpack(words, cols, dtype=int):
+    raw = np.ascontiguousarray(words.astype('<u8')).view(np.uint8)
+    bits = np.unpackbits(raw, axis=1, bitorder='little')
+    return bits[:, :cols].astype(dtype)
+
+
+def _row_mask(cols):
+    # Máscara de los bits válidos de cada palabra (la última puede estar incompleta)
+    nwords = words_per_row(cols)
+    mask = np.full(nwords, ~np.uint64(0), dtype=np.uint64)
+    extra = nwords * WORD_BITS - cols
+    if extra:
+        mask[-1] = ~np.uint64(0) >> np.uint64(extra)
+    return mask
+
+
+_ONE = np.uint64(1)
+_TOP = np.uint64(WORD_BITS - 1)
+
+
+def _west(words, cols, wrap):
+    # Para cada celda, el valor de su vecino a la izquierda (columna c - 1)
+    out = words << _ONE
+    out[:, 1:] |= words[:, :-1] >> _TOP
+    if wrap:
+        last = (cols - 1) % WORD_BITS
+        out[:, 0] |= (words[:, -1] >> np.uint64(last)) & _ONE
+    return out
+
+
+def _east(words, cols, wrap):
+    # Para cada celda, el valor de su vecino a la derecha (columna c + 1)
+    out = words >> _ONE
+    out[:, :-1] |= words[:, 1:] << _TOP
+    if wrap:
+        last = (cols - 1) % WORD_BITS
+        out[:, -1] |= (words[:, 0] & _ONE) << np.uint64(last)
+    return out
+
+
+def _shift_rows(words, offset, wrap):
+    # Fila r recibe la fila r - offset (la de arriba si offset = 1)
+    if wrap:
+        return np.roll(words, offset, axis=0)
+    out = np.zeros_like(words)
+    if offset > 0:
+        out[offset:] = words[:-offset]
+    else:
+        out[:offset] = words[-offset:]
+    return out
+
+
+def step_packed(words, cols, wrap=False):
+    west = _west(words, cols, wrap)
+    east = _east(words, cols, wrap)
+
+    # Suma horizontal de tres celdas (oeste, centro, este) como número de 2 bits
+    x = west ^ east
+    row0 = x ^ words
+    row1 = (west & east) | (x & words)
+
+    # La fila propia aporta sólo oeste + este
+    mid0 = x
+    mid1 = west & east
+
+    up0 = _shift_rows(row0, 1, wrap)
+    up1 = _shift_rows(row1, 1, wrap)
+    down0 = _shift_rows(row0, -1, wrap)
+    down1 = _shift_rows(row1, -1, wrap)
+
+    # Sumadores completos: arriba + abajo (0..6), luego + fila propia (0..8)
+    s0 = up0 ^ down0
+    k0 = up0 & down0
+    t = up1 ^ down1
+    s1 = t ^ k0
+    s2 = (up1 & down1) | (k0 & t)
+
+    t0 = s0 ^ mid0
+    c0 = s0 & mid0
+    t = s1 ^ mid1
+    t1 = t ^ c0
+    c1 = (s1 & mid1) | (c0 & t)
+    high = s2 | c1
+
+    # Vive si el total es 3, o si es 2 y la celda ya estaba viva
+    return t1 & ~high & (t0 | words) & _row_mask(cols)
+
+
+class BitGrid:
+    def __init__(self, rows, cols, wrap=False):
+        self.rows = rows
+        self.cols = cols
+        self.wrap = wrap
+        self.words = np.zeros((rows, words_per_row(cols)), dtype=np.uint64)
+
+    @classmethod
+    def from_array(cls, grid, wrap=False):
+        bit_grid = cls(grid.shape[0], grid.shape[1], wrap)
+        bit_grid.words = pack(grid)
+        return bit_grid
+
+    def to_array(self, dtype=int):
+        return unpack(self.words, self.cols, dtype)
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self.words = step_packed(self.words, self.cols, self.wrap)
+
+    def population(self):
+        raw = self.words.view(np.uint8)
+        return int(np.unpackbits(raw).sum())
+
+    def nbytes(self):
+        return self.words.nbytes
+
+
+def step(grid, wrap=False):
+    # Adaptador con la misma firma que los motores de life.py
+    return unpack(step_packed(pack(grid), grid.shape[1], wrap), grid.shape[1], grid.dtype)
@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import rules
+from life import _check_rule, _step_padded
+
+# Motores paralelos: el tablero se divide en franjas de filas (2D) o de planos
+# (3D) y cada hilo calcula la suya leyendo un halo de una celda de las franjas
+# vecinas. NumPy libera el GIL durante las operaciones sobre arreglos, así que
+# los hilos corren en paralelo. Se usan dos buffers que se intercambian al final
+# de cada generación; el resultado no depende de la cantidad de hilos.
+
+
+def _slabs(n, workers):
+    bounds = np.linspace(0, n, min(workers, n) + 1).astype(int)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class ParallelLife:
+    def __init__(self, grid, workers=None, wrap=False, rule=rules.CONWAY):
+        _check_rule(rule)
+        self.workers = workers or os.cpu_count() or 1
+        self.wrap = wrap
+        self.rule = rule
+        self.dtype = grid.dtype
+        self.rows, self.cols = grid.shape
+        # Buffers con borde de una celda; el borde hace de halo entre franjas
+        self._cur = np.zeros((self.rows + 2, self.cols + 2), dtype=np.uint8)
+        self._next = np.zeros_like(self._cur)
+        self._cur[1:-1, 1:-1] = grid == 1
+        self._slabs = _slabs(self.rows, self.workers)
+        self._pool = ThreadPoolExecutor(self.workers)
+        self.generation = 0
+
+    @property
+    def grid(self):
+        return self._cur[1:-1, 1:-1]
+
+    def to_array(self):
+        return self.grid.astype(self.dtype)
+
+    def _step_slab(self, r0, r1):
+        self._next[r0 + 1:r1 + 1, 1:-1] = _step_padded(self._cur[r0:r1 + 2], np.uint8, self.rule)
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            if self.wrap:
+                cur = self._cur
+                cur[0, 1:-1] = cur[-2, 1:-1]
+                cur[-1, 1:-1] = cur[1, 1:-1]
+                cur[:, 0] = cur[:, -2]
+                cur[:, -1] = cur[:, 1]
+            # Esperar a todas las franjas funciona como barrera antes del intercambio
+            for future in [self._pool.submit(self._step_slab, r0, r1) for r0, r1 in self._slabs]:
+                future.result()
+            self._cur, self._next = self._next, self._cur
+            self.generation += 1
+        return self.grid
+
+    def close(self):
+        self._pool.shutdown()
+
+
+class ParallelLife3D:
+    def __init__(self, cells, birth=(4,), survival=(4, 5, 6), workers=None, rule=None):
+        if rule is None:
+            rule = rules.Rule(birth, survival, dims=3)
+        _check_rule(rule, dims=3)
+        self.workers = workers or os.cpu_count() or 1
+        self.dtype = cells.dtype
+        self.size = cells.shape[0]
+        self.rule = rule
+        # Halo sólo en el eje 0, los ejes 1 y 2 se envuelven con np.roll
+        self._cur = np.zeros((cells.shape[0] + 2,) + cells.shape[1:], dtype=np.uint8)
+        self._next = np.zeros_like(self._cur)
+        self._cur[1:-1] = cells == 1
+        self._slabs = _slabs(cells.shape[0], self.workers)
+        self._pool = ThreadPoolExecutor(self.workers)
+        self.generation = 0
+
+    @property
+    def cells(self):
+        return self._cur[1:-1]
+
+    def to_array(self):
+        return self.cells.astype(self.dtype)
+
+    def _step_slab(self, x0, x1):
+        block = self._cur[x0:x1 + 2]
+        total = block[:-2] + block[1:-1] + block[2:]
+        for axis in (1, 2):
+            total = np.roll(total, 1, axis=axis) + total + np.roll(total, -1, axis=axis)
+        alive = block[1:-1]
+        self._next[x0 + 1:x1 + 1] = rules.apply(self.rule, alive, total - alive)
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._cur[0] = self._cur[-2]
+            self._cur[-1] = self._cur[1]
+            for future in [self._pool.submit(self._step_slab, x0, x1) for x0, x1 in self._slabs]:
+                future.result()
+            self._cur, self._next = self._next, self._cur
+            self.generation += 1
+        return self.cells
+
+    def close(self):
+        self._pool.shutdown()
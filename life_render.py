@@ -0,0 +1,42 @@
+import numpy as np
+import pygame
+
+# Dibujo de la grilla con un par de blits por cuadro: la grilla numpy se copia a
+# una superficie de 8 bits de una celda por píxel (0 = muerta, 1 = viva) que
+# luego se escala al tamaño de la ventana.
+
+
+class GridRenderer:
+    def __init__(self, rows, cols, cell_size, alive=(255, 255, 255), dead=(0, 0, 0), lines=None):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        size = (cols * cell_size, rows * cell_size)
+
+        self._cells = pygame.Surface((cols, rows), 0, 8)
+        self._cells.set_palette([dead, alive] + [dead] * 254)
+        self._scaled = pygame.Surface(size, 0, self._cells)
+        self._scaled.set_palette(self._cells.get_palette())
+        self._pixels = np.zeros((cols, rows), dtype=np.uint8)
+
+        # Líneas de la grilla precalculadas, con el fondo transparente
+        self._overlay = None
+        if lines is not None:
+            key = (255, 0, 255) if lines != (255, 0, 255) else (0, 255, 0)
+            self._overlay = pygame.Surface(size)
+            self._overlay.fill(key)
+            self._overlay.set_colorkey(key)
+            for x in range(0, size[0], cell_size):
+                pygame.draw.line(self._overlay, lines, (x, 0), (x, size[1] - 1))
+            for y in range(0, size[1], cell_size):
+                pygame.draw.line(self._overlay, lines, (0, y), (size[0] - 1, y))
+
+    def draw(self, screen, grid, pos=(0, 0)):
+        # surfarray usa índices (x, y), la grilla (fila, columna)
+        np.equal(grid.T, 1, out=self._pixels, casting='unsafe')
+        pygame.surfarray.blit_array(self._cells, self._pixels)
+        pygame.transform.scale(self._cells, self._scaled.get_size(), self._scaled)
+        screen.blit(self._scaled, pos)
+        if self._overlay is not None:
+            screen.blit(self._overlay, pos)
+
@@ -0,0 +1,120 @@
+import numpy as np
+
+import rules
+from life import _check_rule
+
+# Motor disperso para la Vida 2D sobre el plano infinito. Sólo se guardan las
+# celdas vivas, como claves int64 ordenadas (fila en los 32 bits altos y
+# columna desplazada a un entero sin signo en los 32 bajos), así memoria y
+# tiempo por generación dependen de la cantidad de celdas vivas y no del
+# tamaño de la caja que las contiene.
+#
+# Cada generación suma las 8 claves vecinas de cada celda viva y cuenta las
+# repeticiones con np.unique: el conteo de cada clave es su cantidad de vecinos.
+
+_OFFSET = 1 << 31
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+# Desplazamiento de la clave hacia cada uno de los 8 vecinos. Mientras las
+# coordenadas queden dentro de int32, la columna nunca desborda hacia la fila.
+_NEIGHBORS = np.array([(dr << _SHIFT) + dc for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc],
+                      dtype=np.int64)
+
+
+def pack(rows, cols):
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    return (rows << _SHIFT) | (cols + _OFFSET)
+
+
+def unpack(keys):
+    return keys >> _SHIFT, (keys & _MASK) - _OFFSET
+
+
+class SparseLife:
+    def __init__(self, rows=(), cols=(), rule=rules.CONWAY):
+        _check_rule(rule)
+        if 0 in rule.birth:
+            raise ValueError(f"Con {rule} nacerían infinitas celdas en el plano vacío")
+        self.rule = rule
+        self.keys = np.unique(pack(rows, cols))
+        self.generation = 0
+
+    @classmethod
+    def from_array(cls, grid, top=0, left=0, rule=rules.CONWAY):
+        # La celda grid[0, 0] queda en la posición (top, left) del plano
+        rows, cols = np.nonzero(grid == 1)
+        return cls(rows + top, cols + left, rule)
+
+    def step(self, generations=1):
+        table = self.rule.table
+        for _ in range(generations):
+            keys = self.keys
+            if not len(keys):
+                break
+            candidates, counts = np.unique((keys[:, None] + _NEIGHBORS).ravel(), return_counts=True)
+            # Estado actual de cada candidata: búsqueda en las claves ordenadas
+            at = np.minimum(np.searchsorted(keys, candidates), len(keys) - 1)
+            alive = (keys[at] == candidates).astype(np.uint8)
+            lives = rules.apply(self.rule, alive, counts.astype(np.uint8)).astype(bool)
+            new_keys = candidates[lives]
+            if table[1, 0]:
+                # Las celdas vivas sin vecinos no aparecen entre las candidatas
+                lonely = keys[~np.isin(keys, candidates, assume_unique=True)]
+                new_keys = np.union1d(new_keys, lonely)
+            self.keys = new_keys
+            self.generation += 1
+        return self
+
+    # --- edición y consulta ---
+
+    def cells(self):
+        # (filas, columnas) de las celdas vivas, ordenadas por fila y columna
+        return unpack(self.keys)
+
+    def get(self, row, col):
+        key = int(pack(row, col))
+        at = np.searchsorted(self.keys, key)
+        return bool(at < len(self.keys) and self.keys[at] == key)
+
+    def set(self, row, col, alive=True):
+        key = pack(row, col)
+        if alive:
+            self.keys = np.union1d(self.keys, [key])
+        else:
+            self.keys = self.keys[self.keys != key]
+
+    def toggle(self, row, col):
+        self.set(row, col, not self.get(row, col))
+
+    def population(self):
+        return len(self.keys)
+
+    def bbox(self):
+        # (fila mínima, columna mínima, fila máxima, columna máxima) o None si está vacío
+        if not len(self.keys):
+            return None
+        rows, cols = self.cells()
+        return int(rows[0]), int(cols.min()), int(rows[-1]), int(cols.max())
+
+    def to_array(self, rows, cols, top=0, left=0, dtype=int):
+        # Ventana rows x cols del plano cuya esquina superior izquierda es (top, left).
+        # Las claves están ordenadas por fila, así las filas de la ventana son un tramo contiguo.
+        out = np.zeros((rows, cols), dtype=dtype)
+        lo, hi = np.searchsorted(self.keys, [int(pack(top, -_OFFSET)), int(pack(top + rows, -_OFFSET))])
+        r, c = unpack(self.keys[lo:hi])
+        inside = (c >= left) & (c < left + cols)
+        out[r[inside] - top, c[inside] - left] = 1
+        return out
+
+    def nbytes(self):
+        return self.keys.nbytes
+
+    def stats(self):
+        return {
+            'generation': self.generation,
+            'population': self.population(),
+            'bbox': self.bbox(),
+            'nbytes': self.nbytes(),
+        }
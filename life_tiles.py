@@ -0,0 +1,158 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import rules
+from life import _check_rule
+
+# Actualización por teselas: sólo se recalculan las teselas que cambiaron en la
+# generación anterior y sus vecinas. Una tesela cuyo entorno no cambió no puede
+# cambiar, así que el resultado es idéntico al del motor denso.
+#
+# Las teselas activas se calculan todas juntas: se apilan en un bloque
+# (N, t+2, t+2) con su borde, se cuentan vecinos y se aplica la regla una sola
+# vez, como en bricks3d. El tablero se guarda redondeado a teselas enteras; las
+# celdas que sobran quedan siempre en cero.
+
+
+class TiledLife:
+    def __init__(self, grid, tile=32, wrap=False, rule=rules.CONWAY):
+        _check_rule(rule)
+        self.tile = tile
+        self.wrap = wrap
+        self.rule = rule
+        self.load(grid)
+
+    def load(self, grid):
+        # Reemplaza el tablero completo y marca todas las teselas como activas
+        self.dtype = grid.dtype
+        self.rows, self.cols = grid.shape
+        t = self.tile
+        self.tile_rows = -(-self.rows // t)
+        self.tile_cols = -(-self.cols // t)
+        self._buf = np.zeros((self.tile_rows * t + 2, self.tile_cols * t + 2), dtype=np.uint8)
+        self._buf[1:self.rows + 1, 1:self.cols + 1] = grid == 1
+        self.grid = self._buf[1:self.rows + 1, 1:self.cols + 1]
+        # Vistas (tile_rows, tile_cols, t+2, t+2) de cada tesela con su borde
+        self._windows = sliding_window_view(self._buf, (t + 2, t + 2))[::t, ::t]
+        # Celdas de cada tesela que caen dentro del tablero
+        inside = np.zeros((self.tile_rows * t, self.tile_cols * t), dtype=np.uint8)
+        inside[:self.rows, :self.cols] = 1
+        self._inside = inside.reshape(self.tile_rows, t, self.tile_cols, t).swapaxes(1, 2)
+        # Interior de cada tesela, como vista escribible del tablero
+        self._tiles = self._buf[1:-1, 1:-1].reshape(self.tile_rows, t, self.tile_cols, t).swapaxes(1, 2)
+        self.active = np.ones((self.tile_rows, self.tile_cols), dtype=bool)
+        # Celdas cambiadas desde la última llamada a changed_cells() (None: todas)
+        self._changed = None
+        self._changed_count = 0
+        self.generation = 0
+        self.active_tiles = 0
+        self.skipped_tiles = 0
+        self.total_active = 0
+        self.total_skipped = 0
+
+    def mark(self, r, c):
+        # Llamar después de editar una celda a mano para que su tesela se recalcule
+        self.active[r // self.tile, c // self.tile] = True
+        self._record(np.array([r * self.cols + c], dtype=np.intp))
+
+    def to_array(self):
+        return self.grid.astype(self.dtype)
+
+    def changed_cells(self):
+        # Índices planos (fila * cols + columna) de las celdas que cambiaron (o
+        # se marcaron) desde la llamada anterior, para
+        # LifeTelemetry.observe(changed=...). Devuelve None si se calculó el
+        # tablero entero o cambió más de la mitad: entonces comparar todo es
+        # más barato que juntar los índices.
+        changed, self._changed = self._changed, []
+        self._changed_count = 0
+        if changed is None:
+            return None
+        if not changed:
+            return np.zeros(0, dtype=np.intp)
+        return changed[0] if len(changed) == 1 else np.unique(np.concatenate(changed))
+
+    def _record(self, cells):
+        if self._changed is None:
+            return
+        self._changed.append(cells)
+        self._changed_count += len(cells)
+        if 2 * self._changed_count > self.rows * self.cols:
+            self._changed = None
+
+    def _refresh_halo(self):
+        buf, rows, cols = self._buf, self.rows, self.cols
+        if self.wrap:
+            buf[0, 1:cols + 1] = buf[rows, 1:cols + 1]
+            buf[rows + 1, 1:cols + 1] = buf[1, 1:cols + 1]
+            buf[:rows + 2, 0] = buf[:rows + 2, cols]
+            buf[:rows + 2, cols + 1] = buf[:rows + 2, 1]
+
+    def _dilate(self, mask):
+        # Teselas activas más sus ocho vecinas
+        padded = np.pad(mask, 1, mode='wrap' if self.wrap else 'constant')
+        out = np.zeros_like(mask)
+        for dr in range(3):
+            for dc in range(3):
+                out |= padded[dr:dr + self.tile_rows, dc:dc + self.tile_cols]
+        return out
+
+    def _next(self, padded, inside):
+        # Siguiente estado del interior de bloques (N, h+2, w+2) con borde
+        total = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        total = total[:, :, :-2] + total[:, :, 1:-1] + total[:, :, 2:]
+        alive = padded[:, 1:-1, 1:-1]
+        new = rules.apply(self.rule, alive, total - alive)
+        # Fuera del tablero (incluido el borde del toroide si cae dentro de una tesela) todo es cero
+        new &= inside
+        return new, new != alive & inside
+
+    def _step_tiles(self, ii, jj):
+        # Todas las teselas a calcular en un bloque, leyendo la generación actual...
+        new, diff = self._next(self._windows[ii, jj], self._inside[ii, jj])
+        changed = diff.reshape(len(ii), -1).any(axis=1)
+        # ...y luego se escriben sólo las que cambiaron
+        self.active = np.zeros_like(self.active)
+        self.active[ii[changed], jj[changed]] = True
+        self._tiles[ii[changed], jj[changed]] = new[changed]
+        if self._changed is not None:
+            n, r, c = np.nonzero(diff[changed])
+            t = self.tile
+            self._record((ii[changed][n] * t + r) * self.cols + jj[changed][n] * t + c)
+
+    def _step_all(self):
+        # Con todas las teselas activas se calcula el tablero entero sin apilar copias
+        t = self.tile
+        inside = self._inside.swapaxes(1, 2).reshape(self.tile_rows * t, self.tile_cols * t)
+        new, diff = self._next(self._buf[None], inside)
+        self.active = diff[0].reshape(self.tile_rows, t, self.tile_cols, t).any(axis=(1, 3))
+        self._buf[1:-1, 1:-1] = new[0]
+        self._changed = None
+
+    def step(self):
+        self._refresh_halo()
+        todo = self._dilate(self.active)
+        if todo.all():
+            self._step_all()
+        elif todo.any():
+            self._step_tiles(*np.nonzero(todo))
+        else:
+            # Tablero quieto: no hay nada que recalcular
+            self.active = np.zeros_like(self.active)
+
+        self.generation += 1
+        self.active_tiles = int(todo.sum())
+        self.skipped_tiles = todo.size - self.active_tiles
+        self.total_active += self.active_tiles
+        self.total_skipped += self.skipped_tiles
+        return self.grid
+
+    def stats(self):
+        return {
+            'generation': self.generation,
+            'active_tiles': self.active_tiles,
+            'skipped_tiles': self.skipped_tiles,
+            'changed_tiles': int(self.active.sum()),
+            'total_active': self.total_active,
+            'total_skipped': self.total_skipped,
+        }
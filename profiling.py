@@ -0,0 +1,188 @@
+import collections
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Per-phase instrumentation for the ecosystem World.update and the Simulation
+# that draws it. A Profiler records, for every tick, the wall time and number
+# of items handled by each phase, the population of each species and, on
+# sampled ticks, the bytes allocated per phase (tracemalloc only runs during
+# those ticks, since tracing every allocation slows the model several times).
+# Recent ticks are kept in a ring for rolling summaries and as Chrome
+# trace-event JSON (chrome://tracing or ui.perfetto.dev).
+#
+# World.profiler defaults to NULL, whose hooks do nothing, so an
+# uninstrumented tick costs a handful of empty method calls.
+
+
+class NullProfiler:
+    enabled = False
+    _phase = nullcontext()
+
+    def begin_tick(self, world):
+        pass
+
+    def end_tick(self, world):
+        pass
+
+    def phase(self, name, items=None):
+        return self._phase
+
+
+NULL = NullProfiler()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'items', 'start', 'memory')
+
+    def __init__(self, profiler, name, items):
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.memory = tracemalloc.get_traced_memory()[0] if self.profiler._tracing else None
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        allocated = None
+        if self.memory is not None:
+            allocated = tracemalloc.get_traced_memory()[0] - self.memory
+        self.profiler._record(self.name, self.start, end, self.items, allocated)
+        return False
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, window=256, memory_every=0, species_of=None):
+        # window: ticks kept for summaries and traces; memory_every: trace
+        # allocations on one tick in every memory_every (0 never);
+        # species_of(organism) gives the population key (default: class name)
+        self.window = window
+        self.memory_every = memory_every
+        self.species_of = species_of or (lambda organism: type(organism).__name__)
+        self.ticks = collections.deque(maxlen=window)
+        self.tick = None
+        self._tracing = False
+        self._origin = time.perf_counter_ns()
+
+    # --- hooks ---
+
+    def begin_tick(self, world):
+        self.tick = {'tick': world.time + 1, 'start': time.perf_counter_ns(), 'phases': []}
+        if self.memory_every and (world.time + 1) % self.memory_every == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def end_tick(self, world):
+        tick = self.tick
+        if tick is None:
+            return
+        tick['end'] = time.perf_counter_ns()
+        tick['population'] = dict(collections.Counter(map(self.species_of, world.organisms)))
+        if getattr(world, 'plants', None) is not None:
+            # Raster plants (ecosystem.PlantField) are not organisms
+            tick['population']['Plant'] = world.plants.count()
+        if self._tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            tick['memory'] = {'net': current, 'peak': peak}
+            tracemalloc.stop()
+            self._tracing = False
+        self.ticks.append(tick)
+        self.tick = None
+
+    def phase(self, name, items=None):
+        # Times the with block as phase name; items is how many things it handled
+        return _Phase(self, name, items)
+
+    def _record(self, name, start, end, items, allocated):
+        if self.tick is None:
+            # Phases outside a tick (e.g. drawing) go in the last finished tick
+            if not self.ticks:
+                return
+            tick = self.ticks[-1]
+            tick['outside'] = tick.get('outside', 0) + end - start
+        else:
+            tick = self.tick
+        tick['phases'].append((name, start, end, items, allocated))
+
+    # --- reports ---
+
+    def summary(self):
+        # Totals over the ticks in the window, per phase and for whole ticks
+        # (including phases timed between ticks, such as drawing)
+        phases = {}
+        tick_times = []
+        for tick in self.ticks:
+            tick_times.append(tick['end'] - tick['start'] + tick.get('outside', 0))
+            for name, start, end, items, allocated in tick['phases']:
+                stats = phases.setdefault(name, {'calls': 0, 'items': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                                 'allocated': 0, 'sampled': 0})
+                ms = (end - start) / 1e6
+                stats['calls'] += 1
+                stats['items'] += items or 0
+                stats['total_ms'] += ms
+                stats['max_ms'] = max(stats['max_ms'], ms)
+                if allocated is not None:
+                    stats['allocated'] += allocated
+                    stats['sampled'] += 1
+        total = sum(tick_times) / 1e6
+        for stats in phases.values():
+            stats['mean_ms'] = stats['total_ms'] / stats['calls']
+            stats['share'] = stats['total_ms'] / total if total else 0.0
+            allocated, sampled = stats.pop('allocated'), stats.pop('sampled')
+            stats['allocated_per_call'] = allocated / sampled if sampled else None
+        last = self.ticks[-1] if self.ticks else {}
+        memory = [tick['memory'] for tick in self.ticks if 'memory' in tick]
+        return {
+            'ticks': len(self.ticks),
+            'tick_mean_ms': total / len(tick_times) if tick_times else 0.0,
+            'tick_max_ms': max(tick_times) / 1e6 if tick_times else 0.0,
+            'population': last.get('population', {}),
+            'peak_bytes': max((m['peak'] for m in memory), default=None),
+            'phases': phases,
+        }
+
+    def format_summary(self):
+        summary = self.summary()
+        lines = [f"{summary['ticks']} ticks, {summary['tick_mean_ms']:.2f} ms mean, "
+                 f"{summary['tick_max_ms']:.2f} ms max, population {summary['population']}"]
+        for name, stats in sorted(summary['phases'].items(), key=lambda item: -item[1]['total_ms']):
+            allocated = stats['allocated_per_call']
+            lines.append(f"  {name:<12} {stats['mean_ms']:8.3f} ms {stats['share']:6.1%} "
+                         f"{stats['items'] / stats['calls']:10.1f} items"
+                         + (f" {allocated / 1024:10.1f} KiB" if allocated is not None else ""))
+        return '\n'.join(lines)
+
+    def trace_events(self):
+        # Chrome trace events: one complete event per tick and per phase, and
+        # counters for the populations and sampled memory
+        def us(ns):
+            return (ns - self._origin) / 1000
+
+        events = []
+        for tick in self.ticks:
+            events.append({'name': 'tick', 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': us(tick['start']),
+                           'dur': (tick['end'] - tick['start']) / 1000, 'args': {'tick': tick['tick']}})
+            for name, start, end, items, allocated in tick['phases']:
+                args = {}
+                if items is not None:
+                    args['items'] = items
+                if allocated is not None:
+                    args['allocated'] = allocated
+                events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': us(start),
+                               'dur': (end - start) / 1000, 'args': args})
+            events.append({'name': 'population', 'ph': 'C', 'pid': 1, 'ts': us(tick['end']),
+                           'args': tick['population']})
+            if 'memory' in tick:
+                events.append({'name': 'memory', 'ph': 'C', 'pid': 1, 'ts': us(tick['end']),
+                               'args': tick['memory']})
+        return events
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
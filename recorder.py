@@ -0,0 +1,93 @@
+import os
+import struct
+
+import numpy as np
+
+# Grabación de historias de la Vida 2D/3D. Cada generación se guarda como un
+# cuadro de bits empaquetados (1 bit por celda) de tamaño fijo, así el cuadro k
+# empieza en HEADER_SIZE + k * frame_bytes y se puede leer con np.memmap sin
+# volver a simular. Un archivo .idx al lado guarda el número de generación de
+# cada cuadro, para grabar cada N generaciones.
+
+MAGIC = b'LIFEREC1'
+HEADER_SIZE = 64
+_HEADER = struct.Struct('<8sI3IQ')
+
+
+def _index_path(path):
+    return path + '.idx'
+
+
+class Recorder:
+    def __init__(self, path, shape, every=1):
+        if not 1 <= len(shape) <= 3:
+            raise ValueError(f"Sólo se graban estados de 1 a 3 dimensiones, no {shape}")
+        self.path = path
+        self.shape = tuple(shape)
+        self.every = every
+        self.frame_bytes = (int(np.prod(shape)) + 7) // 8
+        self.frames = 0
+        self._data = open(path, 'wb')
+        self._index = open(_index_path(path), 'wb')
+        dims = list(self.shape) + [0] * (3 - len(self.shape))
+        header = _HEADER.pack(MAGIC, len(self.shape), *dims, self.frame_bytes)
+        self._data.write(header.ljust(HEADER_SIZE, b'\0'))
+
+    def record(self, generation, state):
+        # Guarda state si generation cae en el intervalo de grabación
+        if generation % self.every:
+            return False
+        if state.shape != self.shape:
+            raise ValueError(f"Forma {state.shape} distinta de la grabación {self.shape}")
+        self._data.write(np.packbits(state == 1).tobytes())
+        self._index.write(struct.pack('<q', generation))
+        self.frames += 1
+        return True
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Replay:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, ndim, *dims, frame_bytes = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es una grabación de la Vida")
+        self.shape = tuple(dims[:ndim])
+        self.frame_bytes = frame_bytes
+
+        # Sólo se consideran cuadros completos (la grabación puede seguir abierta)
+        count = (os.path.getsize(path) - HEADER_SIZE) // frame_bytes
+        count = min(count, os.path.getsize(_index_path(path)) // 8)
+        self.frames = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                                shape=(count, frame_bytes)) if count else np.zeros((0, frame_bytes), np.uint8)
+        self.generations = np.memmap(_index_path(path), dtype='<i8', mode='r',
+                                     shape=(count,)) if count else np.zeros(0, '<i8')
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, k, dtype=int):
+        # Estado del cuadro k; la lectura del memmap no copia el archivo entero
+        bits = np.unpackbits(self.frames[k], count=int(np.prod(self.shape)))
+        return bits.reshape(self.shape).astype(dtype)
+
+    def at(self, generation, dtype=int):
+        # Último cuadro grabado en o antes de generation: (generación, estado)
+        k = int(np.searchsorted(self.generations, generation, side='right')) - 1
+        if k < 0:
+            raise KeyError(f"No hay cuadros grabados hasta la generación {generation}")
+        return int(self.generations[k]), self.frame(k, dtype)
@@ -0,0 +1,62 @@
+import zlib
+
+import numpy as np
+
+# Shared randomness service. A RandomStream wraps an np.random.Generator,
+# hands out scalars from pre-generated blocks (for code that draws one number
+# at a time) and offers vectorized helpers for seeding whole boards. Every
+# stream is reproducible from its seed, and named child streams give each
+# simulation its own independent sequence derived from one root seed.
+
+
+class RandomStream:
+    def __init__(self, seed=None, block=4096):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_seq = seed
+        self.generator = np.random.Generator(np.random.PCG64(seed))
+        self.block = block
+        self._floats = iter(())
+
+    def spawn(self, name):
+        # Child stream keyed by name: the same root seed and name always give
+        # the same sequence, whatever other streams were used before
+        key = zlib.crc32(name.encode())
+        child = np.random.SeedSequence(self.seed_seq.entropy,
+                                       spawn_key=self.seed_seq.spawn_key + (key,))
+        return RandomStream(child, self.block)
+
+    # --- scalar draws, drop-in for the random module functions used here ---
+
+    def random(self):
+        try:
+            return next(self._floats)
+        except StopIteration:
+            self._floats = iter(self.generator.random(self.block).tolist())
+            return next(self._floats)
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        # Inclusive on both ends, like random.randint
+        return a + int(self.random() * (b - a + 1))
+
+    def randrange(self, n):
+        return int(self.random() * n)
+
+    # --- vectorized draws ---
+
+    def integers(self, low, high, size=None):
+        return self.generator.integers(low, high, size)
+
+    def random_grid(self, shape, density, dtype=int):
+        # Each cell is alive independently with probability density
+        return (self.generator.random(shape) < density).astype(dtype)
+
+    def scatter(self, shape, count, dtype=int):
+        # Sets count cells chosen uniformly with replacement, as the old
+        # per-cell loop with two random.randint calls did
+        grid = np.zeros(shape, dtype=dtype)
+        grid.flat[self.generator.integers(0, grid.size, count)] = 1
+        return grid
@@ -0,0 +1,217 @@
+import numpy as np
+
+# Reglas totalísticas externas para la Vida 2D y 3D. Una regla se compila a una
+# tabla [estado, vecinos] -> nuevo estado, así el paso es un único acceso
+# indexado sobre el arreglo de conteos sin importar qué regla esté activa.
+#
+# Notación: 'B3/S23' (o 'S23/B3', o '23/3' con supervivencia primero), con
+# componentes opcionales separados por '/': '3D' para tres dimensiones, 'NM'
+# (Moore) o 'NV' (von Neumann) para la vecindad y 'R2' para el radio. Los
+# conteos se escriben dígito a dígito ('S23') o, para valores de 10 o más,
+# separados por comas y con rangos ('S4-6,10,12-14'; un conteo solo, 'B12,').
+
+
+def neighborhood_size(dims, neighborhood, radius):
+    if neighborhood == 'M':
+        return (2 * radius + 1) ** dims - 1
+    # von Neumann: celdas con distancia Manhattan entre 1 y radius
+    if dims == 2:
+        return 2 * radius * (radius + 1)
+    return sum(4 * (radius - abs(d)) * (radius - abs(d) + 1) // 2 + 1 for d in range(-radius, radius + 1)) - 1
+
+
+class Rule:
+    def __init__(self, birth, survival, dims=2, neighborhood='M', radius=1):
+        if dims not in (2, 3):
+            raise ValueError(f"Sólo hay reglas de 2 o 3 dimensiones, no {dims}")
+        if neighborhood not in ('M', 'V'):
+            raise ValueError(f"Vecindad desconocida: {neighborhood!r} (usar 'M' o 'V')")
+        if radius < 1:
+            raise ValueError(f"El radio debe ser al menos 1, no {radius}")
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        self.dims = dims
+        self.neighborhood = neighborhood
+        self.radius = radius
+        self.max_count = neighborhood_size(dims, neighborhood, radius)
+        for count in self.birth | self.survival:
+            if not 0 <= count <= self.max_count:
+                raise ValueError(f"{count} vecinos no es posible en esta vecindad (máximo {self.max_count})")
+        self.table = np.zeros((2, self.max_count + 1), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survival)] = 1
+        # Con hasta 64 entradas la tabla cabe en un entero: el bit i es la
+        # entrada plana i, y buscarla es un desplazamiento en vez de un take
+        self.bits = None
+        if self.table.size <= 64:
+            self.bits = sum(1 << i for i, v in enumerate(self.table.ravel()) if v)
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return self.birth, self.survival, self.dims, self.neighborhood, self.radius
+
+    def __str__(self):
+        def counts(values):
+            values = sorted(values)
+            if all(v < 10 for v in values):
+                return ''.join(map(str, values))
+            # Con conteos de dos cifras: rangos separados por comas
+            runs = []
+            for v in values:
+                if runs and v == runs[-1][1] + 1:
+                    runs[-1][1] = v
+                else:
+                    runs.append([v, v])
+            text = ','.join(str(a) if a == b else f'{a}-{b}' for a, b in runs)
+            # Un único conteo de dos cifras lleva coma final, si no '12' se leería como 1 y 2
+            return text if ',' in text or '-' in text else text + ','
+        parts = [f'B{counts(self.birth)}', f'S{counts(self.survival)}']
+        if self.dims == 3:
+            parts.append('3D')
+        if self.neighborhood != 'M':
+            parts.append('N' + self.neighborhood)
+        if self.radius != 1:
+            parts.append(f'R{self.radius}')
+        return '/'.join(parts)
+
+    def __repr__(self):
+        return f'Rule({str(self)!r})'
+
+
+def _parse_counts(text):
+    if not text:
+        return set()
+    if ',' not in text and '-' not in text:
+        return {int(c) for c in text}
+    counts = set()
+    for token in text.split(','):
+        if '-' in token:
+            lo, hi = token.split('-')
+            counts.update(range(int(lo), int(hi) + 1))
+        elif token:
+            counts.add(int(token))
+    return counts
+
+
+def parse(rulestring, dims=None):
+    birth = survival = None
+    plain = []
+    neighborhood, radius, parsed_dims = 'M', 1, 2
+    try:
+        for part in rulestring.strip().upper().split('/'):
+            if part in ('3D', 'D3'):
+                parsed_dims = 3
+            elif part in ('2D', 'D2'):
+                parsed_dims = 2
+            elif part.startswith('B'):
+                birth = _parse_counts(part[1:])
+            elif part.startswith('S'):
+                survival = _parse_counts(part[1:])
+            elif part.startswith('N'):
+                neighborhood = part[1:]
+            elif part.startswith('R'):
+                radius = int(part[1:])
+            else:
+                plain.append(_parse_counts(part))
+    except ValueError:
+        raise ValueError(f"Regla inválida: {rulestring!r}") from None
+    # Notación clásica sin letras: supervivencia/nacimiento
+    if plain:
+        if birth is not None or survival is not None or len(plain) != 2:
+            raise ValueError(f"Regla inválida: {rulestring!r}")
+        survival, birth = plain
+    if birth is None or survival is None:
+        raise ValueError(f"Regla inválida: {rulestring!r} (faltan B o S)")
+    return Rule(birth, survival, dims or parsed_dims, neighborhood, radius)
+
+
+CONWAY = Rule({3}, {2, 3})
+
+
+# --- conteo de vecinos ---
+
+def _shift(a, offset, axis, wrap):
+    # Resultado[i] = a[i - offset] a lo largo de axis, con ceros o envolviendo
+    if offset == 0:
+        return a
+    if wrap:
+        return np.roll(a, offset, axis=axis)
+    out = np.zeros_like(a)
+    n = a.shape[axis]
+    if abs(offset) >= n:
+        return out
+    dst = [slice(None)] * a.ndim
+    src = [slice(None)] * a.ndim
+    if offset > 0:
+        dst[axis], src[axis] = slice(offset, None), slice(None, n - offset)
+    else:
+        dst[axis], src[axis] = slice(None, n + offset), slice(-offset, None)
+    out[tuple(dst)] = a[tuple(src)]
+    return out
+
+
+def box_sum(a, radius, axis, wrap):
+    # Suma de a[i - radius .. i + radius] a lo largo de axis con sumas acumuladas,
+    # el costo no depende del radio
+    if radius == 0:
+        return a
+    n = a.shape[axis]
+    pad = [(0, 0)] * a.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(a, pad, mode='wrap' if wrap else 'constant')
+    zero_shape = list(padded.shape)
+    zero_shape[axis] = 1
+    acc = np.concatenate([np.zeros(zero_shape, dtype=np.int32), np.cumsum(padded, axis=axis, dtype=np.int32)],
+                         axis=axis)
+    hi = [slice(None)] * a.ndim
+    lo = [slice(None)] * a.ndim
+    hi[axis] = slice(2 * radius + 1, 2 * radius + 1 + n)
+    lo[axis] = slice(0, n)
+    return acc[tuple(hi)] - acc[tuple(lo)]
+
+
+def count_neighbors(cells, rule, wrap):
+    live = (cells == 1).astype(np.int32)
+    r = rule.radius
+    if rule.neighborhood == 'M':
+        total = live
+        for axis in range(live.ndim):
+            total = box_sum(total, r, axis, wrap)
+        return total - live
+    # von Neumann: por cada desplazamiento en los primeros ejes, una caja sobre el último
+    total = np.zeros_like(live)
+    last = live.ndim - 1
+    if live.ndim == 2:
+        offsets = [(d,) for d in range(-r, r + 1)]
+    else:
+        offsets = [(dx, dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1) if abs(dx) + abs(dy) <= r]
+    for offset in offsets:
+        part = box_sum(live, r - sum(map(abs, offset)), last, wrap)
+        for axis, d in enumerate(offset):
+            part = _shift(part, d, axis, wrap)
+        total += part
+    return total - live
+
+
+def apply(rule, alive, counts, dtype=np.uint8):
+    # Nuevo estado de cada celda a partir de su estado (0/1) y sus vecinos vivos:
+    # un solo acceso a la tabla con el índice plano estado * (máximo + 1) + vecinos
+    index = counts + alive * counts.dtype.type(rule.max_count + 1)
+    if rule.bits is None:
+        return rule.table.ravel().take(index).astype(dtype, copy=False)
+    word = np.uint32 if rule.table.size <= 32 else np.uint64
+    out = np.right_shift(word(rule.bits), index, dtype=word, casting='unsafe')
+    out &= word(1)
+    return out.astype(dtype, copy=False)
+
+
+def step(cells, rule=CONWAY, wrap=False):
+    if cells.ndim != rule.dims:
+        raise ValueError(f"La regla {rule} es de {rule.dims} dimensiones y el tablero de {cells.ndim}")
+    alive = (cells == 1).astype(np.uint8)
+    return apply(rule, alive, count_neighbors(cells, rule, wrap), cells.dtype)
@@ -0,0 +1,40 @@
+import time
+
+# Decouples simulation ticks from rendered frames. FixedStep tells the render
+# loop how many simulation steps are due since the last frame, so when drawing
+# falls behind the loop runs several steps per frame and drops frames instead.
+# With max_steps, a frame that takes longer than max_steps / steps_per_sec
+# seconds drops steps too.
+
+
+class FixedStep:
+    def __init__(self, steps_per_sec, max_steps=None, clock=time.perf_counter):
+        # max_steps caps the steps run per frame. Time due beyond the cap is
+        # dropped, so a step slower than the interval slows the simulation down
+        # instead of piling up an ever larger backlog.
+        self.clock = clock
+        self.max_steps = max_steps
+        self.set_rate(steps_per_sec)
+        self.reset()
+
+    def set_rate(self, steps_per_sec):
+        self.steps_per_sec = steps_per_sec
+        self.interval = 1.0 / steps_per_sec
+
+    def reset(self):
+        # Forget accumulated time, e.g. after a pause, so resuming does not burst
+        self._last = self.clock()
+        self._pending = 0.0
+
+    def due(self):
+        now = self.clock()
+        self._pending += now - self._last
+        self._last = now
+        steps = int(self._pending // self.interval)
+        if self.max_steps is not None and steps > self.max_steps:
+            steps = self.max_steps
+            self._pending %= self.interval
+        else:
+            self._pending -= steps * self.interval
+        return steps
+
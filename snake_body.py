@@ -0,0 +1,75 @@
+import random
+from collections import deque
+
+# Snake body for 3dsnake.py on an arena x arena x arena wraparound grid. Cells
+# are packed into a single int (x + y*n + z*n*n); the body is a deque of packed
+# cells and an occupancy bytearray counts how many segments sit on each cell,
+# so advancing, growing and collision checks are all O(1).
+
+
+class SnakeBody:
+    def __init__(self, head=(0, 0, 0), arena=10):
+        self.arena = arena
+        self.cells = deque()
+        self.occupied = bytearray(arena ** 3)
+        self._push(self.pack(head))
+
+    def pack(self, pos):
+        n = self.arena
+        x, y, z = pos
+        return x % n + (y % n) * n + (z % n) * n * n
+
+    def unpack(self, cell):
+        n = self.arena
+        return cell % n, cell // n % n, cell // (n * n)
+
+    def _push(self, cell):
+        self.cells.appendleft(cell)
+        self.occupied[cell] += 1
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return (self.unpack(cell) for cell in self.cells)
+
+    @property
+    def head(self):
+        return self.unpack(self.cells[0])
+
+    def next_head(self, direction):
+        x, y, z = self.head
+        return self.pack((x + direction[0], y + direction[1], z + direction[2]))
+
+    def advance(self, direction, grow=False):
+        # Moves one cell in direction, keeping the tail when grow is set.
+        # Returns (new head, freed tail or None).
+        cell = self.next_head(direction)
+        tail = None
+        if not grow:
+            tail = self.cells.pop()
+            self.occupied[tail] -= 1
+        self._push(cell)
+        return self.unpack(cell), (self.unpack(tail) if tail is not None else None)
+
+    def contains(self, pos):
+        return self.occupied[self.pack(pos)] > 0
+
+    def hits_self(self):
+        # True when the head shares its cell with another segment
+        return self.occupied[self.cells[0]] > 1
+
+    def place_food(self, rng=random):
+        # Random free cell (None if the arena is full). A few random probes find
+        # one quickly while the snake is short; after that the first free cell
+        # from a random starting point is taken with a C-speed search.
+        n3 = len(self.occupied)
+        for _ in range(16):
+            cell = rng.randrange(n3)
+            if not self.occupied[cell]:
+                return self.unpack(cell)
+        start = rng.randrange(n3)
+        cell = self.occupied.find(0, start)
+        if cell < 0:
+            cell = self.occupied.find(0, 0, start)
+        return self.unpack(cell) if cell >= 0 else None
@@ -0,0 +1,218 @@
+import numpy as np
+
+from rng import RandomStream
+
+# Headless batch of independent 3D snake games for agent training, with the
+# rules of 3dsnake.py: six movement directions on an arena x arena x arena
+# wraparound grid, growth by one segment on eating, and food respawning on a
+# free cell. Every game lives in one row of NumPy arrays (ring buffer of packed
+# body cells, occupancy counts, head pointer, length, food, score), and step()
+# advances all of them with a fixed number of array operations.
+#
+# Unlike the interactive game, running into the body ends the episode
+# (die_on_self=False keeps the original pass-through behaviour). Episodes also
+# end when the snake fills the arena or after max_steps, and finished games are
+# reset automatically.
+
+# Action index -> direction, with the keys 3dsnake.py binds them to
+DIRECTIONS = np.array([
+    (1, 0, 0),   # d
+    (-1, 0, 0),  # a
+    (0, 1, 0),   # w
+    (0, -1, 0),  # s
+    (0, 0, 1),   # e
+    (0, 0, -1),  # q
+], dtype=np.int64)
+
+OBS_SIZE = 15
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(state):
+    # splitmix64 output function: 64 random bits from each (already advanced) state
+    z = state.copy()
+    z ^= z >> np.uint64(30)
+    z *= _MIX1
+    z ^= z >> np.uint64(27)
+    z *= _MIX2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+class SnakeEnv:
+    def __init__(self, num_envs, arena=10, seed=None, max_steps=1000, die_on_self=True):
+        self.num_envs = num_envs
+        self.arena = arena
+        self.cells = arena ** 3
+        self.max_steps = max_steps
+        self.die_on_self = die_on_self
+        n, cells = num_envs, self.cells
+        self.body = np.zeros((n, cells), dtype=np.int32)
+        self.occupied = np.zeros((n, cells), dtype=np.uint8)
+        self.head_index = np.zeros(n, dtype=np.int64)
+        self.length = np.ones(n, dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self._rows = np.arange(n)
+        self._row_start = self._rows[:, None] * cells
+        # Per-cell lookup tables shared by all games: coordinates and the packed
+        # neighbour in each direction, so moving and observing are pure gathers
+        every = np.arange(cells)
+        self._coords = np.stack(self.unpack(every), axis=1)
+        self._neighbours = np.stack([self.pack(*(self._coords + d).T) for d in DIRECTIONS], axis=1)
+        # One splitmix64 stream per game, so food placement is vectorised too
+        self._rng_state = np.zeros(n, dtype=np.uint64)
+        self.reset(seed)
+
+    # --- packing ---
+
+    def pack(self, x, y, z):
+        n = self.arena
+        return x % n + (y % n) * n + (z % n) * n * n
+
+    def unpack(self, cell):
+        n = self.arena
+        return cell % n, cell // n % n, cell // (n * n)
+
+    # --- episodes ---
+
+    def reset(self, seed=None, seeds=None):
+        # seeds gives every game its own seed; otherwise game i uses seed + i,
+        # so a game's sequence does not depend on how many run alongside it
+        if seeds is None:
+            if seed is None:
+                seed = int(RandomStream().integers(0, 1 << 62))
+            seeds = np.arange(self.num_envs) + seed
+        self._rng_state[:] = np.asarray(seeds).astype(np.uint64)
+        self._reset_rows(self._rows)
+        return self.observe()
+
+    def _reset_rows(self, rows):
+        # Snake of length 1 at the origin heading +x, as in 3dsnake.py
+        self.occupied[rows] = 0
+        self.body[rows, 0] = 0
+        self.occupied[rows, 0] = 1
+        self.head_index[rows] = 0
+        self.length[rows] = 1
+        self.head[rows] = 0
+        self.direction[rows] = 0
+        self.score[rows] = 0
+        self.steps[rows] = 0
+        self._place_food(rows)
+
+    def _random_cells(self, rows):
+        self._rng_state[rows] += _GOLDEN
+        bits = _mix(self._rng_state[rows]) >> np.uint64(32)
+        return ((bits * np.uint64(self.cells)) >> np.uint64(32)).astype(np.int64)
+
+    def _place_food(self, rows):
+        # A few random probes find a free cell while the snakes are short; the
+        # rest pick uniformly among their free cells. Returns the rows whose
+        # arena is full (no food placed).
+        for _ in range(8):
+            if not len(rows):
+                return rows
+            cells = self._random_cells(rows)
+            free = self.occupied[rows, cells] == 0
+            self.food[rows[free]] = cells[free]
+            rows = rows[~free]
+        if not len(rows):
+            return rows
+        free = self.occupied[rows] == 0
+        count = free.sum(axis=1)
+        full = count == 0
+        rank = self._random_cells(rows) % np.maximum(count, 1)
+        choice = np.argmax(np.cumsum(free, axis=1) > rank[:, None], axis=1)
+        self.food[rows[~full]] = choice[~full]
+        return rows[full]
+
+    # --- stepping ---
+
+    def step(self, actions):
+        # actions: one DIRECTIONS index per game. Returns
+        # (observation, reward, terminated, truncated, info) like a vector env;
+        # the observation of a finished game is already that of its new episode.
+        cells = self.cells
+        start = self._row_start[:, 0]
+        occupied = self.occupied.ravel()
+        body = self.body.ravel()
+        actions = np.asarray(actions, dtype=np.int64)
+        self.direction[:] = actions
+        new_head = self._neighbours.ravel().take(self.head * len(DIRECTIONS) + actions)
+        ate = new_head == self.food
+
+        # The tail moves away first, so following it closely is not a collision.
+        # All indices are flat (row * cells + cell): cheaper than 2D fancy indexing.
+        moving = start[~ate]
+        tail_index = (self.head_index[~ate] - self.length[~ate] + 1) % cells
+        occupied[moving + body.take(moving + tail_index)] -= 1
+        self.length += ate
+
+        at = start + new_head
+        hit = occupied.take(at) != 0
+        self.head_index += 1
+        self.head_index %= cells
+        body[start + self.head_index] = new_head
+        occupied[at] += 1
+        self.head = new_head
+        self.score += ate
+        self.steps += 1
+
+        reward = ate.astype(np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        if self.die_on_self:
+            reward[hit] = -1.0
+            terminated |= hit
+        eaten = np.flatnonzero(ate & ~terminated)
+        full = self._place_food(eaten)
+        terminated[full] = True
+        truncated = (self.steps >= self.max_steps) & ~terminated
+
+        done = np.flatnonzero(terminated | truncated)
+        info = {}
+        if len(done):
+            info = {'done': done, 'final_score': self.score[done].copy(), 'final_length': self.length[done].copy()}
+            self._reset_rows(done)
+        return self.observe(), reward, terminated, truncated, info
+
+    # --- observations ---
+
+    def observe(self):
+        # (num_envs, OBS_SIZE) float32: head and food positions scaled to [0, 1),
+        # the wrapped food offset scaled to [-0.5, 0.5), and whether each of the
+        # six neighbouring cells is occupied by the body
+        n = self.arena
+        obs = np.empty((self.num_envs, OBS_SIZE), dtype=np.float32)
+        head = self._coords.take(self.head, axis=0)
+        food = self._coords.take(self.food, axis=0)
+        obs[:, 0:3] = head
+        obs[:, 3:6] = food
+        obs[:, 6:9] = (food - head + n // 2) % n - n // 2
+        obs[:, 0:9] *= 1 / n
+        # Flat indices into occupied avoid a slower 2D fancy index
+        neighbours = self._neighbours.take(self.head, axis=0) + self._row_start
+        obs[:, 9:15] = self.occupied.ravel().take(neighbours) != 0
+        return obs
+
+    def volumes(self, rows=None):
+        # Full (games, 3, n, n, n) uint8 observation: body, head and food
+        # channels indexed [x, y, z]. Costs arena^3 per game, so on demand only.
+        rows = self._rows if rows is None else np.asarray(rows)
+        n = self.arena
+        out = np.zeros((len(rows), 3, self.cells), dtype=np.uint8)
+        out[:, 0] = self.occupied[rows] > 0
+        out[np.arange(len(rows)), 1, self.head[rows]] = 1
+        out[np.arange(len(rows)), 2, self.food[rows]] = 1
+        # Packed cells are x + y*n + z*n*n, so reshaping gives [z, y, x]
+        return out.reshape(len(rows), 3, n, n, n).transpose(0, 1, 4, 3, 2)
+
+    def body_cells(self, row):
+        # Packed body cells of one game, head first
+        index = (self.head_index[row] - np.arange(self.length[row])) % self.cells
+        return self.body[row, index]
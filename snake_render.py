@@ -0,0 +1,168 @@
+from collections import deque
+
+import numpy as np
+
+# Retained-mode cube renderer for 3dsnake.py. One unit-cube vertex buffer is
+# shared by every cube; per-cube offsets and colours live in an instance buffer
+# that is updated a slot at a time, and the whole scene is drawn with a single
+# glDrawArraysInstanced call.
+
+VERTEX_SHADER = """
+#version 120
+attribute vec3 position;
+attribute vec3 offset;
+attribute vec3 color;
+varying vec3 v_color;
+void main() {
+    v_color = color;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(position + offset, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+varying vec3 v_color;
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+
+def unit_cube():
+    # 6 faces x 2 triangles, centred on the origin
+    corners = np.array([[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)],
+                       dtype=np.float32)
+    faces = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+    triangles = [i for a, b, c, d in faces for i in (a, b, c, a, c, d)]
+    return corners[triangles]
+
+
+class CubeInstances:
+    def __init__(self, capacity=1024, gl=None):
+        if gl is None:
+            from OpenGL import GL as gl
+        self.gl = gl
+        self.count = 0
+        self.offsets = np.zeros((capacity, 3), dtype=np.float32)
+        self.colors = np.zeros((capacity, 3), dtype=np.float32)
+        self.vertices = unit_cube()
+        self._dirty = None
+        self._reallocate = True
+        self._program = None
+
+    @property
+    def capacity(self):
+        return len(self.offsets)
+
+    def add(self, pos, color):
+        if self.count == self.capacity:
+            self.offsets = np.concatenate([self.offsets, np.zeros_like(self.offsets)])
+            self.colors = np.concatenate([self.colors, np.zeros_like(self.colors)])
+            self._reallocate = True
+        slot = self.count
+        self.count += 1
+        self.set(slot, pos, color)
+        return slot
+
+    def set(self, slot, pos, color=None):
+        self.offsets[slot] = pos
+        if color is not None:
+            self.colors[slot] = color
+        lo, hi = self._dirty or (slot, slot + 1)
+        self._dirty = (min(lo, slot), max(hi, slot + 1))
+
+    # --- GL side ---
+
+    def reset_gl(self):
+        # Call after the GL context is recreated (e.g. on window resize)
+        self._program = None
+
+    def _init_gl(self):
+        gl = self.gl
+        program = gl.glCreateProgram()
+        for kind, source in ((gl.GL_VERTEX_SHADER, VERTEX_SHADER), (gl.GL_FRAGMENT_SHADER, FRAGMENT_SHADER)):
+            shader = gl.glCreateShader(kind)
+            gl.glShaderSource(shader, source)
+            gl.glCompileShader(shader)
+            if not gl.glGetShaderiv(shader, gl.GL_COMPILE_STATUS):
+                raise RuntimeError(gl.glGetShaderInfoLog(shader))
+            gl.glAttachShader(program, shader)
+        gl.glLinkProgram(program)
+        if not gl.glGetProgramiv(program, gl.GL_LINK_STATUS):
+            raise RuntimeError(gl.glGetProgramInfoLog(program))
+        self._program = program
+        self._attribs = {name: gl.glGetAttribLocation(program, name) for name in ('position', 'offset', 'color')}
+
+        self._vertex_buffer = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vertex_buffer)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, gl.GL_STATIC_DRAW)
+        self._offset_buffer = gl.glGenBuffers(1)
+        self._color_buffer = gl.glGenBuffers(1)
+        self._reallocate = True
+
+    def _upload(self):
+        gl = self.gl
+        if self._reallocate:
+            # Whole buffers: first upload or after the capacity grew
+            for buffer, data in ((self._offset_buffer, self.offsets), (self._color_buffer, self.colors)):
+                gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+                gl.glBufferData(gl.GL_ARRAY_BUFFER, data.nbytes, data, gl.GL_DYNAMIC_DRAW)
+            self._reallocate = False
+        elif self._dirty is not None:
+            lo, hi = self._dirty
+            for buffer, data in ((self._offset_buffer, self.offsets), (self._color_buffer, self.colors)):
+                gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+                gl.glBufferSubData(gl.GL_ARRAY_BUFFER, lo * 12, (hi - lo) * 12, data[lo:hi])
+        self._dirty = None
+
+    def draw(self):
+        gl = self.gl
+        if self._program is None:
+            self._init_gl()
+        self._upload()
+        if not self.count:
+            return
+        gl.glUseProgram(self._program)
+        for name, buffer, divisor in (('position', self._vertex_buffer, 0),
+                                      ('offset', self._offset_buffer, 1),
+                                      ('color', self._color_buffer, 1)):
+            location = self._attribs[name]
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer)
+            gl.glEnableVertexAttribArray(location)
+            gl.glVertexAttribPointer(location, 3, gl.GL_FLOAT, gl.GL_FALSE, 0, None)
+            gl.glVertexAttribDivisor(location, divisor)
+        gl.glDrawArraysInstanced(gl.GL_TRIANGLES, 0, len(self.vertices), self.count)
+        for location in self._attribs.values():
+            gl.glVertexAttribDivisor(location, 0)
+            gl.glDisableVertexAttribArray(location)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glUseProgram(0)
+
+
+class SnakeRenderer:
+    # Slot 0 holds the food; the snake body uses the following slots. Moving
+    # without growing reuses the tail's slot for the new head, so each step
+    # rewrites a single instance.
+
+    def __init__(self, head, food, snake_color=(0, 1, 0), food_color=(1, 0, 0), capacity=1024, gl=None):
+        self.snake_color = snake_color
+        self.cubes = CubeInstances(capacity, gl)
+        self.cubes.add(food, food_color)
+        self.slots = deque([self.cubes.add(head, snake_color)])
+
+    def advance(self, head, grow=False):
+        if grow:
+            slot = self.cubes.add(head, self.snake_color)
+        else:
+            slot = self.slots.pop()
+            self.cubes.set(slot, head)
+        self.slots.appendleft(slot)
+
+    def set_food(self, food):
+        self.cubes.set(0, food)
+
+    def reset_gl(self):
+        self.cubes.reset_gl()
+
+    def draw(self):
+        self.cubes.draw()
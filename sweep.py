@@ -0,0 +1,196 @@
+import argparse
+import ast
+import contextlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ecosystem import Plant, Herbivore, Carnivore, World
+from ecosystem_soa import ArrayWorld
+
+# Parameter sweeps over the ecosystem model. Every combination of a parameter
+# grid is run once per seed in a process pool. Workers write the per-tick
+# population of each species straight into one shared-memory block, so only the
+# run number and its length travel back through pickles.
+#
+# Parameters are species class attributes named 'Class.attribute', e.g.
+# {'Herbivore.reproduce_threshold': [120, 150], 'Plant.growth_range': [(0.1, 0.3)]}.
+
+SPECIES = (Plant, Herbivore, Carnivore)
+_CLASSES = {species.__name__: species for species in SPECIES}
+
+
+def expand_grid(grid):
+    # Every combination of the grid values, as a list of {name: value} dicts
+    for name in grid:
+        _resolve(name)
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _resolve(name):
+    class_name, _, attribute = name.partition('.')
+    species = _CLASSES.get(class_name)
+    if species is None or not hasattr(species, attribute):
+        raise ValueError(f"Unknown parameter: {name!r} (use 'Class.attribute' on {', '.join(_CLASSES)})")
+    return species, attribute
+
+
+_MISSING = object()
+
+
+@contextlib.contextmanager
+def overrides(params):
+    # Sets the class attributes for the duration of a run and restores them
+    saved = []
+    try:
+        for name, value in params.items():
+            species, attribute = _resolve(name)
+            saved.append((species, attribute, species.__dict__.get(attribute, _MISSING)))
+            setattr(species, attribute, value)
+        yield
+    finally:
+        for species, attribute, value in reversed(saved):
+            if value is _MISSING:
+                delattr(species, attribute)
+            else:
+                setattr(species, attribute, value)
+
+
+def make_world(width, height, seed, counts, backend='array'):
+    # counts: initial (plants, herbivores, carnivores). backend 'raster' is the
+    # object model with plants in a PlantField.
+    if backend == 'array':
+        world = ArrayWorld(width, height, seed)
+        for species, count in zip(SPECIES, counts):
+            world.spawn(species, count)
+        return world
+    world = World(width, height, seed, plant_field=backend == 'raster')
+    rng = world.rng
+    for species, count in zip(SPECIES, counts):
+        for _ in range(count):
+            world.add_organism(species(rng.randint(0, width - 1), rng.randint(0, height - 1), rng))
+    return world
+
+
+def _populations(world):
+    return [world.count(species) for species in SPECIES]
+
+
+def _run(task):
+    # Worker: one run, written into row `run` of the shared populations block
+    run, params, seed, config, block_name, shape = task
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        populations = np.ndarray(shape, dtype=np.int32, buffer=block.buf)[run]
+        with overrides(params):
+            world = make_world(config['width'], config['height'], seed, config['counts'], config['backend'])
+            populations[0] = _populations(world)
+            ticks = 0
+            while ticks < config['ticks']:
+                world.update()
+                ticks += 1
+                populations[ticks] = counts = _populations(world)
+                if config['stop_on_extinction'] and min(counts) == 0:
+                    break
+        del populations
+        return run, ticks
+    finally:
+        block.close()
+
+
+class SweepResult:
+    def __init__(self, params, seeds, populations, ticks):
+        self.params = params
+        self.seeds = seeds
+        # populations[run, tick, species]; rows after ticks[run] are unused (-1)
+        self.populations = populations
+        self.ticks = ticks
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def runs(self):
+        # (params, seed, populations up to the last tick) for every run
+        for run in range(len(self)):
+            yield self.params[run], self.seeds[run], self.populations[run, :self.ticks[run] + 1]
+
+    def save(self, path):
+        np.savez_compressed(path, populations=self.populations, ticks=self.ticks, seeds=np.array(self.seeds),
+                            params=np.array([json.dumps(p) for p in self.params]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls([json.loads(p) for p in data['params']], data['seeds'].tolist(), data['populations'],
+                       data['ticks'])
+
+
+def sweep(grid, seeds, ticks=500, width=100, height=100, counts=(50, 20, 5), backend='array',
+          stop_on_extinction=True, workers=None, progress=None):
+    # Runs every grid combination once per seed. progress(done, total) is
+    # called as runs finish.
+    combos = expand_grid(grid)
+    runs = [(params, seed) for params in combos for seed in seeds]
+    shape = (len(runs), ticks + 1, len(SPECIES))
+    config = {'width': width, 'height': height, 'counts': tuple(counts), 'backend': backend, 'ticks': ticks,
+              'stop_on_extinction': stop_on_extinction}
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 4))
+    try:
+        populations = np.ndarray(shape, dtype=np.int32, buffer=block.buf)
+        populations.fill(-1)
+        lengths = np.zeros(len(runs), dtype=np.int64)
+        tasks = [(run, params, seed, config, block.name, shape) for run, (params, seed) in enumerate(runs)]
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            # Batches keep the per-task overhead low on sweeps of thousands of runs
+            chunk = max(1, len(tasks) // (workers * 8))
+            for done, (run, length) in enumerate(pool.map(_run, tasks, chunksize=chunk), 1):
+                lengths[run] = length
+                if progress is not None:
+                    progress(done, len(tasks))
+        result = SweepResult([params for params, _ in runs], [seed for _, seed in runs], populations.copy(),
+                             lengths)
+        del populations
+    finally:
+        block.close()
+        block.unlink()
+    return result
+
+
+def _parse_param(text):
+    name, _, values = text.partition('=')
+    return name, list(ast.literal_eval(values))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ecosystem parameter sweep.')
+    parser.add_argument('--param', action='append', default=[], type=_parse_param,
+                        help="Class.attribute=[values], e.g. 'Herbivore.speed=[1, 2, 3]'")
+    parser.add_argument('--seeds', type=int, default=4, help='number of seeds per combination')
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--width', type=int, default=100)
+    parser.add_argument('--height', type=int, default=100)
+    parser.add_argument('--counts', type=int, nargs=3, default=[50, 20, 5], metavar=('PLANTS', 'HERB', 'CARN'))
+    parser.add_argument('--backend', choices=('object', 'array', 'raster'), default='array')
+    parser.add_argument('--no-early-stop', action='store_true')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--out', help='write the results to this .npz file')
+    args = parser.parse_args(argv)
+
+    result = sweep(dict(args.param), range(args.seeds), args.ticks, args.width, args.height, args.counts,
+                   args.backend, not args.no_early_stop, args.workers)
+    for params, seed, populations in result.runs():
+        print(json.dumps({'params': params, 'seed': seed, 'ticks': len(populations) - 1,
+                          'final': dict(zip((s.__name__ for s in SPECIES), populations[-1].tolist()))}))
+    if args.out:
+        result.save(args.out)
+
+
+if __name__ == '__main__':
+    main()
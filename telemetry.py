@@ -0,0 +1,251 @@
+import collections
+import csv
+
+import numpy as np
+
+from rng import RandomStream
+
+# Telemetría por generación para tableros de la Vida 2D/3D: población,
+# nacimientos, muertes, caja envolvente y un hash de Zobrist de 64 bits del
+# estado. Todo se actualiza a partir de las celdas que cambiaron respecto de la
+# observación anterior; encontrarlas exige comparar el tablero entero, salvo
+# que el motor diga cuáles pudieron cambiar (ver LifeTelemetry). Un anillo con
+# los hashes recientes detecta tableros muertos o en ciclo para detener la
+# corrida o saltar generaciones.
+
+FIELDS = ('generation', 'population', 'births', 'deaths', 'bbox', 'hash', 'period')
+
+
+class ZobristHash:
+    # Cada celda tiene una clave aleatoria de 64 bits; el hash de un estado es el
+    # XOR de las claves de las celdas vivas, y cambiar una celda es un XOR más
+    def __init__(self, shape, seed=0):
+        generator = RandomStream(seed).spawn('zobrist').generator
+        self.keys = generator.integers(0, 1 << 64, int(np.prod(shape)), dtype=np.uint64, endpoint=False)
+
+    def of(self, state):
+        return int(np.bitwise_xor.reduce(self.keys[np.flatnonzero(state.ravel() == 1)]))
+
+    def toggle(self, value, cells):
+        # cells: índices planos de las celdas que cambiaron de estado
+        if not len(cells):
+            return value
+        return value ^ int(np.bitwise_xor.reduce(self.keys[cells]))
+
+
+class CycleDetector:
+    # Anillo con los últimos size hashes y un diccionario hash -> generación
+    # para buscarlos en O(1); un hash repetido dentro del anillo es un ciclo
+    def __init__(self, size=256):
+        self.ring = collections.deque(maxlen=size)
+        self.seen = {}
+
+    def clear(self):
+        self.ring.clear()
+        self.seen.clear()
+
+    def push(self, generation, key):
+        # Devuelve (inicio, período) si key ya apareció en el anillo, si no None
+        first = self.seen.get(key)
+        if len(self.ring) == self.ring.maxlen:
+            old_key, old_generation = self.ring[0]
+            if self.seen.get(old_key) == old_generation:
+                del self.seen[old_key]
+        self.ring.append((key, generation))
+        self.seen[key] = generation
+        if first is None:
+            return None
+        return first, generation - first
+
+
+class LifeTelemetry:
+    # observe(state) después de cada paso. callback recibe un diccionario con
+    # FIELDS por generación y csv_path escribe lo mismo como CSV. every > 1
+    # observa sólo cada tantas generaciones (el período detectado es entonces
+    # un múltiplo del real, lo que alcanza para remaining()).
+    #
+    # Sin más datos, cada observación compara el tablero entero con la copia
+    # de la anterior: sobre un tablero denso de 1024x1024 eso cuesta tanto como
+    # la generación misma, así que con every=1 la telemetría duplica el costo
+    # del paso y hace falta every=64 para quedar por debajo del 2%. Los motores
+    # que saben qué celdas pudieron cambiar las pasan en observe(changed=...)
+    # y la comparación se limita a ellas, así el costo sigue a la actividad del
+    # tablero. changed puede ser un arreglo de índices planos por generación o
+    # una función que se llama sólo al observar y devuelve los de todas las
+    # generaciones desde la observación anterior (TiledLife.changed_cells);
+    # None, en ambos casos, es comparar todo. Las ediciones a mano entre
+    # observaciones se avisan con mark(), o reset() si se cambia todo.
+
+    def __init__(self, state, ring=256, callback=None, csv_path=None, every=1, seed=0):
+        self.shape = state.shape
+        self.every = every
+        self.callback = callback
+        self.zobrist = ZobristHash(state.shape, seed)
+        self.cycles = CycleDetector(ring)
+        self._csv_file = None
+        self._csv = None
+        if csv_path is not None:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(FIELDS)
+        self.reset(state)
+
+    def reset(self, state, generation=0):
+        # Empieza de cero a partir de state (p. ej. al cargar un tablero nuevo)
+        self._prev = state.copy()
+        self._diff = np.zeros(state.shape, dtype=bool)
+        # Celdas que pudieron cambiar desde la última observación (None: todas)
+        self._pending = []
+        self.generation = generation
+        self.population = int(np.count_nonzero(state == 1))
+        self.hash = self.zobrist.of(state)
+        self._bbox = _bbox(state == 1)
+        self._bbox_stale = False
+        self.births = self.deaths = 0
+        self.cycle_start = self.period = None
+        self.cycles.clear()
+        self.cycles.push(generation, (self.hash, self.population))
+
+    @property
+    def bbox(self):
+        # Sin callback ni CSV la caja se calcula sólo cuando se la pide
+        if self._bbox_stale:
+            self._bbox = _bbox(self._prev == 1)
+            self._bbox_stale = False
+        return self._bbox
+
+    @property
+    def extinct(self):
+        return self.population == 0
+
+    @property
+    def settled(self):
+        # Muerto, estable (período 1) u oscilando: seguir simulando no aporta nada nuevo
+        return self.extinct or self.period is not None
+
+    def remaining(self, target):
+        # Generaciones que faltan simular para tener el estado de la generación
+        # target: dentro de un ciclo basta con avanzar (target - actual) % período
+        if self.period is None or target < self.generation:
+            return target - self.generation
+        return (target - self.generation) % self.period
+
+    def mark(self, cells):
+        # Avisa que las celdas cells (índices planos) se editaron a mano
+        if self._pending is not None:
+            self._pending.append(np.asarray(cells, dtype=np.intp).ravel())
+
+    def observe(self, state, generations=1, changed=None):
+        # changed: celdas que pudieron cambiar (sobran las que no cambiaron),
+        # como arreglo o como función; None compara todo
+        self.generation += generations
+        if not callable(changed):
+            self._hint(changed)
+        if self.generation % self.every:
+            return None
+        if callable(changed):
+            self._hint(changed())
+        changed = self._changed(state)
+        self.births = self.deaths = 0
+        if len(changed):
+            values = _gather(state, changed)
+            self._prev.ravel()[changed] = values
+            self.hash = self.zobrist.toggle(self.hash, changed)
+            self.births = int(np.count_nonzero(values == 1))
+            self.deaths = len(changed) - self.births
+            self.population += self.births - self.deaths
+            if self.callback is None and self._csv is None:
+                self._bbox_stale = True
+            else:
+                self._update_bbox(state, changed, values)
+        # La población acompaña al hash en el anillo para descartar colisiones baratas
+        found = self.cycles.push(self.generation, (self.hash, self.population))
+        self.cycle_start, self.period = found if found else (None, None)
+        if self.callback is None and self._csv is None:
+            return None
+        sample = self.sample()
+        if self.callback is not None:
+            self.callback(sample)
+        if self._csv is not None:
+            self._csv.writerow([sample[field] for field in FIELDS])
+        return sample
+
+    def _hint(self, cells):
+        if cells is None:
+            self._pending = None
+        elif self._pending is not None:
+            self._pending.append(cells)
+
+    def _changed(self, state):
+        # Índices planos de las celdas que cambiaron desde la observación anterior
+        pending, self._pending = self._pending, []
+        if pending is None:
+            np.not_equal(state, self._prev, out=self._diff)
+            return np.flatnonzero(self._diff)
+        if not pending:
+            return np.zeros(0, dtype=np.intp)
+        candidates = pending[0] if len(pending) == 1 else np.unique(np.concatenate(pending))
+        return candidates[_gather(state, candidates) != self._prev.ravel()[candidates]]
+
+    def sample(self):
+        return {
+            'generation': self.generation,
+            'population': self.population,
+            'births': self.births,
+            'deaths': self.deaths,
+            'bbox': self.bbox,
+            'hash': f'{self.hash:016x}',
+            'period': self.period,
+        }
+
+    def _update_bbox(self, state, changed, values):
+        if self.population == 0:
+            self._bbox, self._bbox_stale = None, False
+            return
+        bbox = self.bbox
+        born = changed[values == 1]
+        died = changed[values != 1]
+        if len(died) and bbox is not None:
+            # Sólo una muerte sobre el borde de la caja puede achicarla
+            coords = np.unravel_index(died, self.shape)
+            if any(((axis == lo) | (axis == hi)).any() for axis, (lo, hi) in zip(coords, bbox)):
+                window = tuple(slice(lo, hi + 1) for lo, hi in bbox)
+                inner = _bbox(state[window] == 1)
+                bbox = None if inner is None else tuple(
+                    (lo + a, lo + b) for (lo, _), (a, b) in zip(bbox, inner))
+        if len(born):
+            coords = np.unravel_index(born, self.shape)
+            grown = tuple((int(axis.min()), int(axis.max())) for axis in coords)
+            bbox = grown if bbox is None else tuple(
+                (min(lo, a), max(hi, b)) for (lo, hi), (a, b) in zip(bbox, grown))
+        self._bbox = bbox
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = self._csv = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _gather(state, cells):
+    # state.ravel()[cells] sin copiar el tablero entero cuando state es una vista
+    if state.flags.c_contiguous:
+        return state.ravel()[cells]
+    return state[np.unravel_index(cells, state.shape)]
+
+
+def _bbox(alive):
+    # ((min, max), ...) por eje de las celdas vivas, o None si no hay ninguna
+    bounds = []
+    for axis in range(alive.ndim):
+        other = tuple(a for a in range(alive.ndim) if a != axis)
+        hits = np.flatnonzero(alive.any(axis=other))
+        if not len(hits):
+            return None
+        bounds.append((int(hits[0]), int(hits[-1])))
+    return tuple(bounds)
@@ -0,0 +1,94 @@
+import numpy as np
+
+# Sincronización incremental de la escena 3D: en cada generación sólo se tocan
+# los voxels que nacieron o murieron. Las cajas ocultas se guardan en un pool y
+# se reutilizan. Si hay demasiadas celdas vivas se dibujan bloques de k^3 celdas
+# (nivel de detalle reducido) en lugar de una caja por celda.
+
+
+class VoxelScene:
+    def __init__(self, create, place, cap=20000, hysteresis=0.8):
+        # create(x, y, z, scale) -> caja nueva; place(caja, x, y, z, scale) la reubica
+        self.create = create
+        self.place = place
+        self.cap = cap
+        self.hysteresis = hysteresis
+        self.block = 1
+        self._prev = None
+        self._shown = {}
+        self._pool = []
+        self.born = 0
+        self.died = 0
+
+    def _choose_block(self, cur):
+        # Tamaño de bloque más chico con el que la cantidad de cajas entra en el límite
+        live = int(np.count_nonzero(cur))
+        limit = self.cap if self.block == 1 else self.cap * self.hysteresis
+        if live <= limit:
+            return 1
+        block = max(self.block, 2)
+        while block < max(cur.shape):
+            if np.count_nonzero(self._downsample(cur, block)) <= self.cap:
+                break
+            block *= 2
+        return block
+
+    @staticmethod
+    def _downsample(cur, block):
+        # Un bloque está ocupado si contiene al menos una celda viva
+        shape = [-(-n // block) * block for n in cur.shape]
+        padded = np.zeros(shape, dtype=bool)
+        padded[:cur.shape[0], :cur.shape[1], :cur.shape[2]] = cur
+        nx, ny, nz = (n // block for n in shape)
+        return padded.reshape(nx, block, ny, block, nz, block).any(axis=(1, 3, 5))
+
+    def _hide(self, key):
+        voxel = self._shown.pop(key)
+        voxel.visible = False
+        self._pool.append(voxel)
+
+    def _show(self, key, x, y, z):
+        scale = self.block
+        if scale > 1:
+            # Centro del bloque en coordenadas de celda
+            offset = (scale - 1) / 2
+            x, y, z = x * scale + offset, y * scale + offset, z * scale + offset
+        if self._pool:
+            voxel = self._pool.pop()
+            self.place(voxel, x, y, z, scale)
+        else:
+            voxel = self.create(x, y, z, scale)
+        self._shown[key] = voxel
+
+    def sync(self, cells):
+        cur = np.asarray(cells) == 1
+        block = self._choose_block(cur)
+        if block != self.block:
+            # Cambio de nivel de detalle: se ocultan todas las cajas actuales
+            for key in list(self._shown):
+                self._hide(key)
+            self.block = block
+            self._prev = None
+        if block > 1:
+            cur = self._downsample(cur, block)
+
+        prev = self._prev if self._prev is not None else np.zeros_like(cur)
+        born = np.flatnonzero(cur & ~prev)
+        died = np.flatnonzero(prev & ~cur)
+        for key in died.tolist():
+            self._hide(key)
+        for key, x, y, z in zip(born.tolist(), *(i.tolist() for i in np.unravel_index(born, cur.shape))):
+            self._show(key, x, y, z)
+
+        self._prev = cur
+        self.born = len(born)
+        self.died = len(died)
+
+    def stats(self):
+        return {
+            'shown': len(self._shown),
+            'pooled': len(self._pool),
+            'block': self.block,
+            'born': self.born,
+            'died': self.died,
+        }